@@ -0,0 +1,2 @@
+from .generators import GENERATORS, SCALES, generate
+from .suite import compare, measure, run
@@ -0,0 +1,40 @@
+# Advent of Code 2021, Benchmark
+# (c) blu3r4y
+
+import argparse
+
+from .generators import GENERATORS
+from .suite import compare, read, run, save
+
+
+def scale(text):
+    # keep integral scales as integers, so that they match the defaults
+    value = float(text)
+    return int(value) if value.is_integer() else value
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="benchmark all solutions")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    bench = commands.add_parser("run", help="run the benchmark suite")
+    bench.add_argument("days", nargs="*", type=int, default=sorted(GENERATORS))
+    bench.add_argument("-s", "--scales", nargs="+", type=scale, default=None)
+    bench.add_argument("--seed", type=int, default=0)
+    bench.add_argument("--timeout", type=float, default=600)
+    bench.add_argument("-o", "--output", default="benchmark.json")
+    bench.add_argument("--memory", action="store_true", help="trace peak memory")
+
+    diff = commands.add_parser("compare", help="compare two benchmark results")
+    diff.add_argument("old")
+    diff.add_argument("new")
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        results = run(
+            args.days, args.scales, args.seed, args.timeout, memory=args.memory
+        )
+        save(results, args.output)
+    elif args.command == "compare":
+        compare(read(args.old), read(args.new))
@@ -0,0 +1,494 @@
+# Advent of Code 2021, Benchmark Input Generators
+# (c) blu3r4y
+
+from math import isqrt
+
+import numpy as np
+
+# every generator takes a scale factor and a seeded random generator and returns the
+# raw puzzle input - a scale of 1 is roughly the size of the real puzzle input
+GENERATORS = {}
+
+# default scales of each generator, for days whose solution time
+# explodes with the input size, or that do not scale at all
+SCALES = {}
+
+
+def generator(day, scales=(1, 10, 100)):
+    def _register(func):
+        GENERATORS[day] = func
+        SCALES[day] = scales
+        return func
+
+    return _register
+
+
+def generate(day, scale=1, seed=0):
+    rng = np.random.default_rng(seed)
+    return GENERATORS[day](scale, rng)
+
+
+def lines(rows):
+    return "\n".join(rows)
+
+
+def digits(grid):
+    return lines("".join(map(str, row)) for row in grid)
+
+
+def side(scale, base):
+    # side length of a square grid whose area grows with the scale
+    return max(1, isqrt(int(base * base * scale)))
+
+
+###########################################################################
+
+
+@generator(1, scales=(1, 100, 1000))
+def day1(scale, rng):
+    # a random walk of depth readings, 2000 per scale
+    steps = rng.integers(-20, 40, size=int(2000 * scale))
+    return lines(map(str, 100 + np.abs(np.cumsum(steps))))
+
+
+@generator(2, scales=(1, 10, 100))
+def day2(scale, rng):
+    # 1000 commands per scale, with enough downs to stay below the surface
+    dirs = rng.choice(
+        ["forward", "down", "up"], p=[0.4, 0.35, 0.25], size=int(1000 * scale)
+    )
+    nums = rng.integers(1, 10, size=len(dirs))
+    return lines(f"{d} {n}" for d, n in zip(dirs, nums))
+
+
+@generator(3)
+def day3(scale, rng):
+    # 1000 unique reports per scale, for which the bit criteria never
+    # filter out all values, i.e., both bits remain until one value is left
+    # (an odd number of reports also avoids ties in the gamma rate)
+    n = int(1000 * scale) | 1
+    width = max(12, n.bit_length() + 2)
+
+    def _reports(count, bits):
+        if count == 1:
+            return [format(rng.integers(0, 2**bits), f"0{bits}b") if bits else ""]
+
+        # split among both bits, but never more than what fits into the remaining bits
+        cap = 2 ** (bits - 1)
+        ones = int(
+            np.clip(rng.binomial(count, 0.5), max(1, count - cap), min(cap, count - 1))
+        )
+        return ["0" + r for r in _reports(count - ones, bits - 1)] + [
+            "1" + r for r in _reports(ones, bits - 1)
+        ]
+
+    return lines(rng.permutation(_reports(n, width)))
+
+
+@generator(4, scales=(1, 10, 100))
+def day4(scale, rng):
+    # 100 boards per scale, every board wins once all numbers are drawn
+    draws = rng.permutation(100)
+    boards = [
+        rng.choice(100, size=(5, 5), replace=False) for _ in range(int(100 * scale))
+    ]
+    blocks = [",".join(map(str, draws))]
+    for board in boards:
+        blocks.append(lines(" ".join(f"{v:2d}" for v in row) for row in board))
+    return "\n\n".join(blocks)
+
+
+@generator(5, scales=(1, 10, 100))
+def day5(scale, rng):
+    # 500 vent lines per scale, orthogonal or diagonal, on a 1000x1000 floor
+    rows = []
+    for _ in range(int(500 * scale)):
+        x1, y1 = rng.integers(0, 1000, size=2)
+        kind, length = rng.integers(0, 3), rng.integers(1, 500)
+        dx, dy = rng.choice([-1, 1], size=2)
+        if kind == 0:
+            dy = 0
+        elif kind == 1:
+            dx = 0
+        x2, y2 = np.clip((x1 + dx * length, y1 + dy * length), 0, 999)
+
+        # clipping may break the diagonal, shorten it again
+        if dx != 0 and dy != 0:
+            length = min(abs(x2 - x1), abs(y2 - y1))
+            x2, y2 = x1 + dx * length, y1 + dy * length
+
+        rows.append(f"{x1},{y1} -> {x2},{y2}")
+    return lines(rows)
+
+
+@generator(6, scales=(1, 2, 4))
+def day6(scale, rng):
+    # 300 fish per scale
+    return ",".join(map(str, rng.integers(1, 6, size=int(300 * scale))))
+
+
+@generator(7, scales=(1, 10, 100))
+def day7(scale, rng):
+    # 1000 crabs per scale, within the original range of positions
+    return ",".join(map(str, rng.geometric(1 / 400, size=int(1000 * scale)) % 2000))
+
+
+SEGMENTS = (
+    "abcefg",
+    "cf",
+    "acdeg",
+    "acdfg",
+    "bcdf",
+    "abdfg",
+    "abdefg",
+    "acf",
+    "abcdefg",
+    "abcdfg",
+)
+
+
+@generator(8, scales=(1, 10, 100))
+def day8(scale, rng):
+    # 200 displays per scale, each with randomly wired segments
+    rows = []
+    for _ in range(int(200 * scale)):
+        wiring = dict(zip("abcdefg", rng.permutation(list("abcdefg"))))
+        wired = ["".join(rng.permutation([wiring[s] for s in seg])) for seg in SEGMENTS]
+        patterns = [wired[d] for d in rng.permutation(10)]
+        display = [wired[d] for d in rng.integers(0, 10, size=4)]
+        rows.append(" ".join(patterns) + " | " + " ".join(display))
+    return lines(rows)
+
+
+@generator(9, scales=(1, 10))
+def day9(scale, rng):
+    # 100x100 heightmap per scale, with enough walls to keep basins small
+    n = side(scale, 100)
+    heights = rng.integers(0, 9, size=(n, n))
+    heights[rng.random((n, n)) < 0.45] = 9
+    return digits(heights)
+
+
+CHUNKS = {"(": ")", "[": "]", "{": "}", "<": ">"}
+
+
+@generator(10, scales=(1, 10, 100))
+def day10(scale, rng):
+    # 100 lines per scale, which are either corrupted or incomplete
+    rows = []
+    for _ in range(int(100 * scale)):
+        line, stack = [], []
+        while len(line) < 100:
+            if stack and (len(stack) > 12 or rng.random() < 0.45):
+                line.append(CHUNKS[stack.pop()])
+            else:
+                stack.append(rng.choice(list(CHUNKS)))
+                line.append(stack[-1])
+
+        # open chunks would make this line incomplete, otherwise corrupt it
+        closers = [i for i, ch in enumerate(line) if ch in CHUNKS.values()]
+        if not stack or (closers and rng.random() < 0.5):
+            i = rng.choice(closers)
+            line[i] = rng.choice([ch for ch in CHUNKS.values() if ch != line[i]])
+            line = line[: i + 1 + rng.integers(0, 10)]
+
+        rows.append("".join(line))
+    return lines(rows)
+
+
+@generator(11, scales=(1, 4, 16))
+def day11(scale, rng):
+    # 10x10 octopuses per scale - random grids rarely synchronize, but run into a cycle
+    n = side(scale, 10)
+    return digits(rng.integers(0, 10, size=(n, n)))
+
+
+@generator(12, scales=(1, 2))
+def day12(scale, rng):
+    # the number of paths explodes with the number of caves, so scale them linearly
+    small = ["start", "end"] + [f"s{chr(97 + i)}" for i in range(int(4 * scale))]
+    big = [f"B{chr(65 + i)}" for i in range(max(1, int(2 * scale)))]
+
+    # big caves are never connected to other big caves, which would allow cycles
+    edges = set()
+    for b in big:
+        for s in rng.choice(small, size=3, replace=False):
+            edges.add((s, b))
+    num_edges = len(edges) + min(len(small) + 2, len(small) * (len(small) - 1) // 2 - 1)
+    while len(edges) < num_edges:
+        a, b = rng.choice(small, size=2, replace=False)
+        if (b, a) not in edges and {a, b} != {"start", "end"}:
+            edges.add((a, b))
+
+    return lines(f"{a}-{b}" for a, b in edges)
+
+
+@generator(13, scales=(1, 10, 100))
+def day13(scale, rng):
+    # folds on a 1311x895 paper with 900 dots per scale
+    w, h = 40, 6
+    folds = []
+    for ax in rng.permutation(["x"] * 5 + ["y"] * 7):
+        if ax == "x":
+            folds.append(("x", w))
+            w = 2 * w + 1
+        else:
+            folds.append(("y", h))
+            h = 2 * h + 1
+    folds.reverse()
+
+    # dots on the extremes ensure the full paper size
+    dots = {(w - 1, 0), (0, h - 1)}
+    candidates = rng.integers(0, (w, h), size=(int(900 * scale), 2))
+    for x, y in candidates:
+        # dots must never land on a fold line
+        px, py, valid = x, y, True
+        for ax, num in folds:
+            pos = px if ax == "x" else py
+            if pos == num:
+                valid = False
+                break
+            if pos > num:
+                pos = 2 * num - pos
+            px, py = (pos, py) if ax == "x" else (px, pos)
+        if valid:
+            dots.add((x, y))
+
+    blocks = [
+        lines(f"{x},{y}" for x, y in dots),
+        lines(f"fold along {a}={n}" for a, n in folds),
+    ]
+    return "\n\n".join(blocks)
+
+
+@generator(14, scales=(1, 100, 1000))
+def day14(scale, rng):
+    # a template with 20 elements per scale and rules for all pairs of 10 elements
+    elements = list("BCFHKNOPSV")
+    template = "".join(rng.choice(elements, size=int(20 * scale)))
+    rules = [f"{a}{b} -> {rng.choice(elements)}" for a in elements for b in elements]
+    return template + "\n\n" + lines(rules)
+
+
+@generator(15, scales=(0.25, 1, 4))
+def day15(scale, rng):
+    # a 100x100 risk map per scale, which will be tiled 5x5 for part 2
+    n = side(scale, 100)
+    return digits(rng.integers(1, 10, size=(n, n)))
+
+
+@generator(16, scales=(1, 10, 100))
+def day16(scale, rng):
+    # a random packet hierarchy with 250 packets per scale
+    def _packet(size, depth=0):
+        version = rng.integers(1 if depth == 0 else 0, 8)
+
+        if size <= 1:
+            value = int(rng.integers(0, 2**20))
+            groups = f"{value:b}".zfill(4 * (value.bit_length() // 4 + 1))
+            groups = [groups[i : i + 4] for i in range(0, len(groups), 4)]
+            body = "".join(
+                ("1" if i < len(groups) - 1 else "0") + g for i, g in enumerate(groups)
+            )
+            return f"{version:03b}100" + body
+
+        # keep products from growing too large, comparisons need two sub-packets
+        types = [0, 1, 2, 3] if size <= 4 else [0, 2, 3]
+        type_id = rng.choice(types + [5, 6, 7] if size >= 3 else types)
+        num = 2 if type_id >= 5 else rng.integers(1, 8)
+        num = min(num, size - 1)
+
+        # split the remaining packets among the sub-packets
+        cuts = np.sort(rng.choice(np.arange(1, size - 1), size=num - 1, replace=False))
+        sizes = np.diff(np.concatenate(([0], cuts, [size - 1])))
+        children = "".join(_packet(s, depth + 1) for s in sizes)
+
+        if len(children) < 2**15 and rng.random() < 0.5:
+            return f"{version:03b}{type_id:03b}0{len(children):015b}" + children
+        return f"{version:03b}{type_id:03b}1{num:011b}" + children
+
+    bits = _packet(int(250 * scale))
+    bits += "0" * (-len(bits) % 8)
+    return "".join(f"{int(bits[i : i + 4], 2):X}" for i in range(0, len(bits), 4))
+
+
+@generator(17, scales=(1,))
+def day17(scale, rng):
+    # the target area is bound by the brute-force ranges of the solution
+    x1, y1 = rng.integers(20, 250), rng.integers(-99, -50)
+    x2, y2 = x1 + rng.integers(10, 50), y1 + rng.integers(5, 40)
+    return f"target area: x={x1}..{x2}, y={y1}..{y2}"
+
+
+@generator(18, scales=(0.25, 0.5, 1))
+def day18(scale, rng):
+    # 100 reduced snailfish numbers per scale, part 2 is quadratic in their count
+    def _number(depth):
+        if depth == 4 or (depth > 1 and rng.random() < 0.3):
+            return str(rng.integers(0, 10))
+        return f"[{_number(depth + 1)},{_number(depth + 1)}]"
+
+    return lines(_number(0) for _ in range(int(100 * scale)))
+
+
+@generator(19, scales=(0.5, 1))
+def day19(scale, rng):
+    from day19 import ROTATIONS
+
+    # 30 scanners per scale, connected in a tree of overlapping detection cubes
+    positions = [np.zeros(3, dtype=int)]
+    edges = []
+    for i in range(1, max(2, int(30 * scale))):
+        parent = rng.integers(0, i)
+        offset = rng.integers(-150, 150, size=3)
+        offset[rng.integers(0, 3)] = rng.choice([-1, 1]) * rng.integers(1000, 1200)
+        positions.append(positions[parent] + offset)
+        edges.append((parent, i))
+
+    # beacons are scattered within the range of each scanner
+    beacons = [p + rng.integers(-1000, 1001, size=(20, 3)) for p in positions]
+
+    # ensure at least 12 common beacons between overlapping scanners
+    for a, b in edges:
+        lo = np.maximum(positions[a], positions[b]) - 1000
+        hi = np.minimum(positions[a], positions[b]) + 1000
+        common = np.all((np.vstack(beacons) >= lo) & (np.vstack(beacons) <= hi), axis=1)
+        missing = max(0, 13 - len(np.unique(np.vstack(beacons)[common], axis=0)))
+        beacons.append(rng.integers(lo, hi + 1, size=(missing, 3)))
+
+    beacons = np.unique(np.vstack(beacons), axis=0)
+
+    blocks = []
+    for i, pos in enumerate(positions):
+        rel = beacons[np.all(np.abs(beacons - pos) <= 1000, axis=1)] - pos
+        rot = ROTATIONS[rng.integers(0, len(ROTATIONS))]
+        rows = (",".join(map(str, rot(*xyz))) for xyz in rel.tolist())
+        blocks.append(f"--- scanner {i} ---\n" + lines(rows))
+
+    return "\n\n".join(blocks)
+
+
+@generator(20, scales=(0.25, 1))
+def day20(scale, rng):
+    # a 100x100 image per scale, with an enhancement that flips the infinite void
+    lookup = rng.choice(["#", "."], size=512)
+    lookup[0], lookup[511] = "#", "."
+    n = side(scale, 100)
+    image = rng.choice(["#", "."], size=(n, n))
+    return "".join(lookup) + "\n\n" + lines("".join(row) for row in image)
+
+
+@generator(21, scales=(1,))
+def day21(scale, rng):
+    # there is nothing to scale, only the starting positions vary
+    p1, p2 = rng.integers(1, 11, size=2)
+    return f"Player 1 starting position: {p1}\nPlayer 2 starting position: {p2}"
+
+
+@generator(22, scales=(0.25, 0.5, 1))
+def day22(scale, rng):
+    # 420 reboot steps per scale, the first 20 within the initialization area
+    rows = []
+    for i in range(int(420 * scale)):
+        if i < 20:
+            lo, size = rng.integers(-50, 40, size=3), rng.integers(5, 40, size=3)
+        else:
+            lo, size = rng.integers(-100000, 80000, size=3), rng.integers(
+                5000, 40000, size=3
+            )
+        hi = lo + size
+        state = "on" if i < 10 or rng.random() < 0.6 else "off"
+        rows.append(f"{state} x={lo[0]}..{hi[0]},y={lo[1]}..{hi[1]},z={lo[2]}..{hi[2]}")
+    return lines(rows)
+
+
+# room layouts (top and bottom row) for which both parts are known to be solvable,
+# as some shuffles have no solution once part 2 inserts its two extra rows
+ROOMS = {
+    ("BCBD", "CAAD"),
+    ("CAAC", "BDBD"),
+    ("DCDB", "BCAA"),
+    ("DDBA", "CCBA"),
+    ("ABAD", "CCBD"),
+    ("ACBB", "DCDA"),
+    ("BCBD", "ACAD"),
+    ("BDAC", "DABC"),
+    ("ABBC", "DDCA"),
+    ("BADC", "CBAD"),
+}
+
+
+@generator(23, scales=(1,))
+def day23(scale, rng):
+    # there is nothing to scale, only the amphipods in the rooms are shuffled,
+    # until they form one of the layouts that are known to be solvable
+    while True:
+        top, bot = np.reshape(rng.permutation(list("AABBCCDD")), (2, 4))
+        if ("".join(top), "".join(bot)) in ROOMS:
+            break
+
+    return lines(
+        [
+            "#############",
+            "#...........#",
+            "###" + "#".join(top) + "###",
+            "  #" + "#".join(bot) + "#",
+            "  #########",
+        ]
+    )
+
+
+MONAD = """inp w
+mul x 0
+add x z
+mod x 26
+div z {dz}
+add x {ax}
+eql x w
+eql x 0
+mul y 0
+add y 25
+mul y x
+add y 1
+mul z y
+mul y 0
+add y w
+add y {ay}
+mul y x
+add z y"""
+
+
+@generator(24, scales=(1,))
+def day24(scale, rng):
+    # the model number length is fixed, only the block parameters vary
+    ops = ["push"] * 7 + ["pop"] * 7
+    while True:
+        order, depth = rng.permutation(ops), 0
+        for op in order:
+            depth += 1 if op == "push" else -1
+            if depth < 0:
+                break
+        else:
+            break
+
+    blocks, stack = [], []
+    for op in order:
+        if op == "push":
+            ay = int(rng.integers(0, 17))
+            stack.append(ay)
+            blocks.append(MONAD.format(dz=1, ax=rng.integers(10, 17), ay=ay))
+        else:
+            # the paired digits must differ by at most 8, with a negative ax
+            ay = stack.pop()
+            ax = int(rng.integers(-8, min(8, ay - 1) + 1)) - ay
+            blocks.append(MONAD.format(dz=26, ax=ax, ay=rng.integers(0, 17)))
+
+    return "\n".join(blocks)
+
+
+@generator(25, scales=(0.25, 1))
+def day25(scale, rng):
+    # a 137x139 sea floor per scale, as densely packed as the puzzle input
+    n = side(scale, 138)
+    grid = rng.choice([".", ">", "v"], p=[0.44, 0.29, 0.27], size=(n, n + 2))
+    return lines("".join(row) for row in grid)
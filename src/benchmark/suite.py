@@ -0,0 +1,159 @@
+# Advent of Code 2021, Benchmark Suite
+# (c) blu3r4y
+
+import json
+import multiprocessing as mp
+import os
+import platform
+import subprocess
+from contextlib import redirect_stderr, redirect_stdout
+from datetime import datetime, timezone
+from time import perf_counter
+
+import numpy as np
+
+import progress
+from instrument import configure
+from runner import run_day
+
+from .generators import SCALES, generate
+
+
+def run(days, scales=None, seed=0, timeout=600, **config):
+    results = []
+    for day in days:
+        for scale in scales or SCALES[day]:
+            result = measure(day, scale, seed, timeout, **config)
+            results.append(result)
+            report(result)
+
+    return {"meta": metadata(seed), "results": results}
+
+
+def measure(day, scale, seed=0, timeout=600, **config):
+    # every measurement runs in a fresh process, so that neither caches
+    # nor previous runs affect the timings, and so that it can be killed
+    receiver, sender = mp.Pipe(duplex=False)
+    process = mp.Process(target=_measure, args=(sender, day, scale, seed, config))
+    process.start()
+    sender.close()
+
+    result = {"day": day, "scale": scale, "seed": seed}
+    if receiver.poll(timeout):
+        try:
+            result.update(receiver.recv())
+        except EOFError:
+            result["status"] = "crashed"
+    else:
+        result["status"] = "timeout"
+
+    process.terminate()
+    process.join()
+
+    return result
+
+
+def _measure(conn, day, scale, seed, config):
+    progress.ENABLED = False
+    configure(**config)
+
+    start = perf_counter()
+    data = generate(day, scale, seed)
+    result = {"size": len(data), "generate": perf_counter() - start}
+
+    try:
+        # solutions may print their results or progress, which we do not want here
+        with open(os.devnull, "w") as devnull:
+            with redirect_stdout(devnull), redirect_stderr(devnull):
+                parts = run_day(day, data)
+
+        result["status"] = "ok"
+        result["parts"] = {
+            p["part"]: {
+                "answer": str(p["answer"]),
+                "load": p["load"],
+                "solve": p["wall"],
+                "cpu": p["cpu"],
+                "memory": p["memory"],
+            }
+            for p in parts
+        }
+    except Exception as ex:
+        result["status"] = "error"
+        result["error"] = f"{type(ex).__name__}: {ex}"
+
+    conn.send(result)
+
+
+def metadata(seed):
+    try:
+        cmd = ["git", "rev-parse", "--short", "HEAD"]
+        commit = subprocess.run(cmd, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "seed": seed,
+    }
+
+
+def total_time(result):
+    parts = result.get("parts", {}).values()
+    return sum(p["load"] + p["solve"] for p in parts)
+
+
+def report(result):
+    day, scale, status = result["day"], result["scale"], result["status"]
+    text = f"day {day:2d} | scale {scale:>6} | {status:>7}"
+
+    if status == "ok":
+        text += f" | {result['size']:10d} bytes | total {total_time(result):8.3f}s"
+        for name, part in result["parts"].items():
+            text += f" | {name} {part['solve']:8.3f}s"
+            if part["memory"] is not None:
+                text += f" {part['memory'] / 2**20:8.1f} MiB"
+    elif status == "error":
+        text += f" | {result['error']}"
+
+    print(text)
+
+
+def compare(old, new):
+    before = {(r["day"], r["scale"], r["seed"]): r for r in old["results"]}
+
+    for result in new["results"]:
+        key = result["day"], result["scale"], result["seed"]
+        if key not in before:
+            continue
+
+        prev = before[key]
+        if result["status"] != "ok" or prev["status"] != "ok":
+            print(
+                f"day {key[0]:2d} | scale {key[1]:>6} | {prev['status']} -> {result['status']}"
+            )
+            continue
+
+        # equal seeds generate equal inputs, so answers must not change
+        answers = lambda r: [p["answer"] for p in r["parts"].values()]
+        same = "same" if answers(prev) == answers(result) else "CHANGED"
+
+        t0, t1 = total_time(prev), total_time(result)
+        print(
+            f"day {key[0]:2d} | scale {key[1]:>6} | {t0:8.3f}s -> {t1:8.3f}s "
+            f"| x{t0 / t1 if t1 > 0 else float('inf'):7.2f} | answers {same}"
+        )
+
+
+def save(results, path):
+    with open(path, "w") as fp:
+        json.dump(results, fp, indent=2)
+
+
+def read(path):
+    with open(path) as fp:
+        return json.load(fp)
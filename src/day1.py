@@ -2,29 +2,55 @@
 # (c) blu3r4y
 
 import numpy as np
-from aocd.models import Puzzle
-from funcy import print_calls
 
+from inputs import script_input, script_stream
+from instrument import instrument
 
-@print_calls
+
+@instrument
 def part1(data):
     return np.sum(np.diff(data) > 0)
 
 
-@print_calls
+@instrument
 def part2(data):
     window = np.convolve(data, np.ones(3, dtype=int), "valid")
     return np.sum(np.diff(window) > 0)
 
 
+def count_increases(chunks, lags=(1, 3)):
+    # comparing the sums of two sliding windows of size n is the same as comparing
+    # x[i + n] > x[i], so we only need to carry the last values over chunk boundaries
+    counts = [0] * len(lags)
+    tail = np.empty(0, dtype=int)
+
+    for chunk in chunks:
+        data = np.concatenate((tail, chunk))
+        n, t = len(data), len(tail)
+
+        # only count comparisons that end within the new chunk
+        for i, lag in enumerate(lags):
+            k = max(t, lag)
+            counts[i] += int(np.sum(data[k:] > data[k - lag : n - lag]))
+
+        tail = data[-max(lags) :]
+
+    return counts
+
+
 def load(data):
     return np.fromstring(data, dtype=int, sep="\n")
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2021, day=1)
+    chunks = script_stream(load)
+    if chunks is not None:
+        # stream measurements of any length from stdin in constant memory
+        ans1, ans2 = count_increases(chunks)
+    else:
+        data = script_input(day=1)
+
+        ans1 = part1(load(data))
+        ans2 = part2(load(data))
 
-    ans1 = part1(load(puzzle.input_data))
-    # puzzle.answer_a = ans1
-    ans2 = part2(load(puzzle.input_data))
-    # puzzle.answer_b = ans2
+    print(ans1, ans2, sep="\n")
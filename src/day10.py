@@ -1,44 +1,115 @@
 # Advent of Code 2021, Day 10
 # (c) blu3r4y
 
-from aocd.models import Puzzle
-from funcy import print_calls
+import os
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from funcy import cat, chunks
+
+from inputs import script_input, script_stream
+from instrument import instrument
 
 STARTS = {"(": ")", "[": "]", "{": "}", "<": ">"}
 
 SCORE_CORRUPT = {")": 3, "]": 57, "}": 1197, ">": 25137}
 SCORE_INCOMPLETE = {")": 1, "]": 2, "}": 3, ">": 4}
 
+VALID, CORRUPT, INCOMPLETE = 0, 1, 2
+INT_LIMIT = np.iinfo(np.int64).max
 
-@print_calls
-def part1(data):
-    result = 0
-    for chunk in data:
-        p = Parser(chunk)
-        p.parse()
-        result += p.corrupt
+# status and scores of many lines, as numpy arrays
+Results = namedtuple("Results", "status corrupt complete")
 
-    return result
 
+@instrument
+def part1(data):
+    return total_corrupt(validate_all(data))
 
-@print_calls
+
+@instrument
 def part2(data):
-    result = []
-    for chunk in data:
-        p = Parser(chunk)
-        p.parse()
+    return middle_complete(validate_all(data))
+
+
+def total_corrupt(results):
+    return int(results.corrupt.sum())
 
-        # skip corrupt lines now
-        if p.corrupt > 0:
-            continue
 
-        score = autocomplete_score(p.postfix)
-        result.append(score)
+def middle_complete(results):
+    # skip corrupt and complete lines
+    result = results.complete[results.status == INCOMPLETE]
 
     # get mid point in sorted result list
-    result = sorted(result)
+    result = np.sort(result)
     mid = len(result) // 2
-    return result[mid]
+    return int(result[mid])
+
+
+def validate_all(lines, jobs=1, chunk_size=2**14):
+    # validate an iterable or file of lines in a single pass, where jobs other
+    # than 1 split the work into large chunks for a process pool (None uses all cores)
+    batches = chunks(chunk_size, lines)
+    if jobs == 1:
+        results = list(map(validate_batch, batches))
+    else:
+        # only read as many batches as the workers can take on
+        jobs = jobs or os.cpu_count()
+        with ProcessPoolExecutor(jobs) as pool:
+            results = list(bounded_map(pool, validate_batch, batches, 2 * jobs))
+
+    if not results:
+        results = [validate_batch([])]
+
+    return Results(*(np.concatenate(r) for r in zip(*results)))
+
+
+def bounded_map(pool, func, iterable, window):
+    # same as pool.map, but with at most window tasks in flight
+    pending = deque()
+    for item in iterable:
+        if len(pending) == window:
+            yield pending.popleft().result()
+        pending.append(pool.submit(func, item))
+
+    while pending:
+        yield pending.popleft().result()
+
+
+def validate_batch(lines):
+    status, corrupt, complete = [], [], []
+    for line in lines:
+        c, s = validate(line.rstrip("\n"))
+        status.append(CORRUPT if c else INCOMPLETE if s else VALID)
+        corrupt.append(c)
+        complete.append(s)
+
+    # completion scores of long lines may not fit into 64 bits
+    big = any(s > INT_LIMIT for s in complete)
+    return (
+        np.array(status, dtype=np.uint8),
+        np.array(corrupt, dtype=np.int64),
+        np.array(complete, dtype=object if big else np.int64),
+    )
+
+
+def validate(line):
+    # scan a line with an explicit stack of expected close characters and
+    # return its corruption and completion score - at most one of them is set
+    stack = []
+    push, pop = stack.append, stack.pop
+
+    for ch in line:
+        match = STARTS.get(ch)
+        if match:
+            push(match)
+        elif not stack or pop() != ch:
+            # the first illegal character corrupts the line
+            return SCORE_CORRUPT[ch], 0
+
+    # close all remaining chunks, innermost first
+    return 0, autocomplete_score(reversed(stack))
 
 
 def autocomplete_score(postfix):
@@ -49,80 +120,20 @@ def autocomplete_score(postfix):
     return score
 
 
-###########################################################################
-
-
-class Parser:
-    def __init__(self, chunk, debug=False):
-        self.chunk = chunk
-        self.debug = debug  # verbose debug output
-        self.pos = 0  # scanner position
-        self.corrupt = 0  # corruption score
-        self.postfix = ""  # autocomplete for incomplete line
-
-    @property
-    def eof(self):
-        return self.pos == len(self.chunk)
-
-    @property
-    def peek(self):
-        if self.eof:
-            return None
-
-        # get next character without consuming
-        return self.chunk[self.pos]
-
-    def scan(self):
-        if self.eof:
-            return None
-
-        # consume and get next character
-        ch = self.chunk[self.pos]
-        self.pos += 1
-        return ch
-
-    def parse(self):
-        while self.peek in STARTS:
-            self.parse_chunk()
-
-    def parse_chunk(self):
-        # parse start character
-        start = self.scan()
-
-        assert start in STARTS, f"expected start, not {start} @{self.pos - 1}"
-        match = STARTS[start]
-
-        # parse inner chunk if available
-        ch = self.peek
-        if ch in STARTS:
-            self.parse()
-
-        # parse correct or wrong close character
-        close = self.scan()
-        if close != match:
-            if close:
-                self.corrupt += SCORE_CORRUPT[close]
-                self._debug(f"CORRUPT: expected {match}, got {close} @{self.pos - 1}")
-            else:
-                self.postfix += match
-                self._debug(f"INCOMPLETE: expected {match}, got EOF @{self.pos - 1}")
-
-    def _debug(self, line):
-        if self.debug:
-            print(line)
-
-
-###########################################################################
-
-
 def load(data):
     return data.split("\n")
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2021, day=10)
-
-    ans1 = part1(load(puzzle.input_data))
-    # puzzle.answer_a = ans1
-    ans2 = part2(load(puzzle.input_data))
-    # puzzle.answer_b = ans2
+    blocks = script_stream(load)
+    if blocks is not None:
+        # validate lines of any number from stdin on all cores
+        results = validate_all(cat(blocks), jobs=None)
+        ans1, ans2 = total_corrupt(results), middle_complete(results)
+    else:
+        data = script_input(day=10)
+
+        ans1 = part1(load(data))
+        ans2 = part2(load(data))
+
+    print(ans1, ans2, sep="\n")
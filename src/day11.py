@@ -1,85 +1,118 @@
 # Advent of Code 2021, Day 11
 # (c) blu3r4y
 
+from collections import namedtuple
+from hashlib import blake2b
 from itertools import count
 
 import numpy as np
-from aocd.models import Puzzle
-from funcy import print_calls, remove
 
+from inputs import script_input
+from instrument import instrument
 
-@print_calls
+# the grid repeats every length steps from step start onwards
+Cycle = namedtuple("Cycle", "start length")
+
+
+@instrument
 def part1(arr):
-    return solve(arr, limit=100)
+    return flashes_after(arr, 100)
 
 
-@print_calls
+@instrument
 def part2(arr):
-    return solve(arr, limit=None)
+    return first_sync(arr)
+
+
+def flashes_after(arr, steps):
+    # total flashes after any number of steps, extrapolated from the cycle
+    flashes, cycle = simulate(arr, limit=steps)
+    if cycle is None:
+        return sum(flashes)
+
+    start, length = cycle
+    rounds, rest = divmod(steps - start, length)
+    period = flashes[start : start + length]
+
+    return sum(flashes[:start]) + rounds * sum(period) + sum(period[:rest])
 
 
-def solve(arr, limit):
-    total_flashes = 0
+def first_sync(arr, limit=None):
+    # step at which flashes synchronize, or None if they never will, since the
+    # grid ran into a cycle without synchronizing, or not within limit steps
+    flashes, _ = simulate(arr, limit=limit, until_sync=True)
+    return len(flashes) if flashes and flashes[-1] == arr.size else None
 
-    steps = range(limit) if limit else count()
+
+def find_cycle(arr, limit=None):
+    # the first step of the cycle and its length, or None if the grid does not
+    # repeat within limit steps
+    _, cycle = simulate(arr, limit=limit)
+    return cycle
+
+
+def simulate(arr, limit=None, until_sync=False):
+    # simulate up to limit steps in place, but stop as soon as the grid state
+    # repeats, and return the flashes per step together with the cycle, if any
+    seen = {digest(arr): 0}
+    flashes = []
+
+    steps = range(1, limit + 1) if limit is not None else count(1)
     for step in steps:
-        arr += 1
-
-        # positions to be flashed, i.e. overflowing positions
-        overflow = np.argwhere(arr > 9)
-        overflow = set(map(tuple, overflow))
-        flashed = set()
-
-        while overflow:
-            flash = overflow.pop()
-            if flash not in flashed:
-                flashed.add(flash)
-
-                # increase adjacent and check overflows
-                for adj in adjacent(*flash, arr.shape):
-                    if adj not in flashed:
-                        arr[adj] += 1
-                        if arr[adj] > 9:
-                            overflow.add(adj)
-
-        # reset all flashed positions
-        total_flashes += len(flashed)
-        for xy in flashed:
-            arr[xy] = 0
-
-        # with no limit, return step at which flashes synchronize
-        if limit is None and len(flashed) == arr.size:
-            return step + 1
-
-    # with a limit, return number of total flashes
-    return total_flashes
-
-
-def adjacent(x, y, shape):
-    # get adjacent with diagonals and out-of-bounds check
-    adj = (
-        (x, y),
-        (x, y + 1),
-        (x, y - 1),
-        (x + 1, y),
-        (x - 1, y),
-        (x + 1, y + 1),
-        (x - 1, y - 1),
-        (x + 1, y - 1),
-        (x - 1, y + 1),
-    )
-    return ((x, y) for x, y in adj if 0 <= x < shape[0] and 0 <= y < shape[1])
+        flashes.append(flash(arr))
+        if until_sync and flashes[-1] == arr.size:
+            break
+
+        state = digest(arr)
+        if state in seen:
+            return flashes, Cycle(seen[state], step - seen[state])
+        seen[state] = step
+
+    return flashes, None
+
+
+def digest(arr):
+    # a fixed-size fingerprint of the grid state, where collisions are negligible
+    return blake2b(np.ascontiguousarray(arr), digest_size=16).digest()
+
+
+def flash(arr):
+    # advance the grid by one step in place and return the number of flashes
+    arr += 1
+    flashed = np.zeros(arr.shape, dtype=bool)
+
+    # positions to be flashed, i.e. overflowing positions, in waves
+    frontier = arr > 9
+    while frontier.any():
+        flashed |= frontier
+        arr += adjacent(frontier)
+        frontier = (arr > 9) & ~flashed
+
+    # reset all flashed positions
+    arr[flashed] = 0
+    return int(flashed.sum())
+
+
+def adjacent(mask):
+    # number of adjacent cells in the mask, with diagonals, by summing up
+    # shifted copies of the padded mask, once along each axis
+    padded = np.pad(mask.astype(np.uint8), 1)
+    rows = padded[:-2] + padded[1:-1] + padded[2:]
+    box = rows[:, :-2] + rows[:, 1:-1] + rows[:, 2:]
+    return box - mask
 
 
 def load(data):
     # parse into a 2d matrix of integers
-    return np.fromiter(remove("\n", data), dtype=int).reshape(-1, data.index("\n"))
+    data = data.strip()
+    digits = np.frombuffer(data.replace("\n", "").encode(), dtype=np.uint8)
+    return (digits - ord("0")).reshape(-1, data.index("\n"))
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2021, day=11)
+    data = script_input(day=11)
+
+    ans1 = part1(load(data))
+    ans2 = part2(load(data))
 
-    ans1 = part1(load(puzzle.input_data))
-    # puzzle.answer_a = ans1
-    ans2 = part2(load(puzzle.input_data))
-    # puzzle.answer_b = ans2
+    print(ans1, ans2, sep="\n")
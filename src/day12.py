@@ -1,25 +1,28 @@
 # Advent of Code 2021, Day 12
 # (c) blu3r4y
 
-import networkx as nx
-from aocd.models import Puzzle
-from funcy import ilen, print_calls
+from collections import defaultdict
+
+from funcy import ilen
+
+from inputs import script_input
+from instrument import instrument
 
 START, END = "start", "end"
 
 
-@print_calls
+@instrument
 def part1(graph):
     return ilen(dfs(graph, [START]))
 
 
-@print_calls
+@instrument
 def part2(graph):
     return ilen(dfs(graph, [START], double_visit=True))
 
 
 def dfs(g, path, double_visit=False):
-    for succ in g.neighbors(path[-1]):
+    for succ in g[path[-1]]:
         # never go back to the start
         if succ == START:
             continue
@@ -52,17 +55,19 @@ def visited_small_cave_twice(path):
 
 
 def load(data):
-    graph = nx.Graph()
+    # undirected graph as adjacency sets, without duplicate edges
+    graph = defaultdict(set)
     for line in data.splitlines():
         a, b = line.split("-")
-        graph.add_edge(a, b)
+        graph[a].add(b)
+        graph[b].add(a)
     return graph
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2021, day=12)
+    data = script_input(day=12)
+
+    ans1 = part1(load(data))
+    ans2 = part2(load(data))
 
-    ans1 = part1(load(puzzle.input_data))
-    # puzzle.answer_a = ans1
-    ans2 = part2(load(puzzle.input_data))
-    # puzzle.answer_b = ans2
+    print(ans1, ans2, sep="\n")
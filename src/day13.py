@@ -4,19 +4,20 @@
 from collections import namedtuple
 
 import numpy as np
-from aocd.models import Puzzle
-from funcy import print_calls
 from parse import parse
 
+from inputs import script_input
+from instrument import instrument
+
 Input = namedtuple("Input", ["dots", "folds"])
 
 
-@print_calls
+@instrument
 def part1(data):
     return solve(data, first_fold=True)
 
 
-@print_calls
+@instrument
 def part2(data):
     return solve(data)
 
@@ -100,9 +101,9 @@ def load(data):
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2021, day=13)
+    data = script_input(day=13)
+
+    ans1 = part1(load(data))
+    ans2 = part2(load(data))
 
-    ans1 = part1(load(puzzle.input_data))
-    # puzzle.answer_a = ans1
-    ans2 = part2(load(puzzle.input_data))
-    # puzzle.answer_b = ans2
+    print(ans1, ans2, sep="\n")
@@ -3,19 +3,21 @@
 
 from collections import Counter, namedtuple
 
-from aocd.models import Puzzle
-from funcy import pairwise, print_calls
+from funcy import pairwise
 from parse import parse
 
+from inputs import script_input
+from instrument import instrument
+
 Input = namedtuple("Input", ["seq", "rules"])
 
 
-@print_calls
+@instrument
 def part1(data):
     return solve(data.seq, data.rules, 10)
 
 
-@print_calls
+@instrument
 def part2(data):
     return solve(data.seq, data.rules, 40)
 
@@ -69,9 +71,9 @@ def load(data):
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2021, day=14)
+    data = script_input(day=14)
+
+    ans1 = part1(load(data))
+    ans2 = part2(load(data))
 
-    ans1 = part1(load(puzzle.input_data))
-    # puzzle.answer_a = ans1
-    ans2 = part2(load(puzzle.input_data))
-    # puzzle.answer_b = ans2
+    print(ans1, ans2, sep="\n")
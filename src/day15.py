@@ -1,35 +1,48 @@
 # Advent of Code 2021, Day 15
 # (c) blu3r4y
 
+from heapq import heappop, heappush
 from itertools import product
 
-import networkx as nx
 import numpy as np
-from aocd.models import Puzzle
-from funcy import print_calls, remove
+from funcy import remove
 
+from inputs import script_input
+from instrument import instrument
 
-@print_calls
+
+@instrument
 def part1(arr):
     return solve(arr)
 
 
-@print_calls
+@instrument
 def part2(arr):
     arr = full_map(arr, 5)
     return solve(arr)
 
 
 def solve(arr):
-    grid = nx.grid_2d_graph(*arr.shape)
+    grid = arr.tolist()
+    end = arr.shape[0] - 1, arr.shape[1] - 1
 
     # shortest path by using target vertex weight as edge weight in dijkstra
-    end = arr.shape[0] - 1, arr.shape[1] - 1
-    path = nx.dijkstra_path(grid, (0, 0), end, weight=lambda u, v, d: arr[v])
+    risks = {(0, 0): 0}
+    queue = [(0, (0, 0))]
+    while queue:
+        risk, (x, y) = heappop(queue)
+        if (x, y) == end:
+            return risk
+
+        # skip outdated queue entries
+        if risk > risks[(x, y)]:
+            continue
 
-    # sum of weights, except the first
-    risk = sum(arr[p] for p in path[1:])
-    return risk
+        for ax, ay in adjacent(x, y, arr.shape):
+            total = risk + grid[ax][ay]
+            if total < risks.get((ax, ay), total + 1):
+                risks[(ax, ay)] = total
+                heappush(queue, (total, (ax, ay)))
 
 
 def full_map(tile, n):
@@ -45,15 +58,21 @@ def full_map(tile, n):
     return full
 
 
+def adjacent(x, y, shape):
+    # get neighbours without diagonals and without out of bounds access
+    adj = ((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y))
+    return ((a, b) for a, b in adj if 0 <= a < shape[0] and 0 <= b < shape[1])
+
+
 def load(data):
     # parse into a 2d matrix of integers
     return np.fromiter(remove("\n", data), dtype=int).reshape(-1, data.index("\n"))
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2021, day=15)
+    data = script_input(day=15)
+
+    ans1 = part1(load(data))
+    ans2 = part2(load(data))
 
-    ans1 = part1(load(puzzle.input_data))
-    # puzzle.answer_a = ans1
-    ans2 = part2(load(puzzle.input_data))
-    # puzzle.answer_b = ans2
+    print(ans1, ans2, sep="\n")
@@ -5,15 +5,15 @@ from collections import namedtuple
 from functools import reduce
 from operator import mul
 
-from aocd.models import Puzzle
-from funcy import print_calls
+from inputs import script_input
+from instrument import instrument
 
 Packet = namedtuple("Packet", "i version type value")
 
 DEBUG_MODE = False
 
 
-@print_calls
+@instrument
 def part1(bits):
     packet = parse_packet(bits, perform_ops=False)
 
@@ -26,7 +26,7 @@ def part1(bits):
     return _sum_version(packet)
 
 
-@print_calls
+@instrument
 def part2(bits):
     packet = parse_packet(bits, perform_ops=True)
     return packet.value
@@ -166,9 +166,9 @@ def debug(*args):
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2021, day=16)
+    data = script_input(day=16)
 
-    ans1 = part1(load(puzzle.input_data))
-    # puzzle.answer_a = ans1
-    ans2 = part2(load(puzzle.input_data))
-    # puzzle.answer_b = ans2
+    ans1 = part1(load(data))
+    ans2 = part2(load(data))
+
+    print(ans1, ans2, sep="\n")
@@ -4,20 +4,22 @@
 from itertools import count, repeat
 
 import numpy as np
-from aocd.models import Puzzle
 from dotmap import DotMap
-from funcy import concat, print_calls
+from funcy import concat
 from parse import parse
-from tqdm.auto import tqdm
 
+from inputs import script_input
+from instrument import instrument
+from progress import tqdm
 
-@print_calls
+
+@instrument
 def part1(area):
     highpoint, _ = solve(area, 0, 100)
     return highpoint
 
 
-@print_calls
+@instrument
 def part2(area):
     _, velocities = solve(area, -100, 400)
     return len(velocities)
@@ -75,9 +77,9 @@ def load(data):
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2021, day=17)
+    data = script_input(day=17)
+
+    ans1 = part1(load(data))
+    ans2 = part2(load(data))
 
-    ans1 = part1(load(puzzle.input_data))
-    # puzzle.answer_a = ans1
-    ans2 = part2(load(puzzle.input_data))
-    # puzzle.answer_b = ans2
+    print(ans1, ans2, sep="\n")
@@ -6,21 +6,23 @@ from functools import reduce
 from math import ceil, floor
 from operator import add
 
-from anytree import NodeMixin, PreOrderIter, RenderTree
-from aocd.models import Puzzle
-from funcy import lmap, print_calls, with_next, with_prev
-from tqdm.auto import tqdm
+from anytree import NodeMixin, PreOrderIter
+from funcy import lmap, with_next, with_prev
+
+from inputs import script_input
+from instrument import instrument
+from progress import tqdm
 
 DEBUG_MODE = False
 
 
-@print_calls
+@instrument
 def part1(snails):
     result = reduce(add, snails)
     return result.magnitude
 
 
-@print_calls
+@instrument
 def part2(snails):
     size = len(snails)
     largest = -1
@@ -160,6 +162,8 @@ class SnailNode(NodeMixin):
 
     def render(self):
         # render tree for debugging
+        from anytree import RenderTree
+
         print(RenderTree(self))
 
 
@@ -191,9 +195,9 @@ def debug(*args):
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2021, day=18)
+    data = script_input(day=18)
+
+    ans1 = part1(load(data))
+    ans2 = part2(load(data))
 
-    ans1 = part1(load(puzzle.input_data))
-    # puzzle.answer_a = ans1
-    ans2 = part2(load(puzzle.input_data))
-    # puzzle.answer_b = ans2
+    print(ans1, ans2, sep="\n")
@@ -5,10 +5,12 @@ from collections import defaultdict, deque
 from functools import lru_cache
 from itertools import product
 
-from aocd.models import Puzzle
-from funcy import collecting, print_calls
+from funcy import collecting
 from parse import parse
-from tqdm.auto import tqdm
+
+from inputs import script_input
+from instrument import instrument
+from progress import tqdm
 
 ROTATIONS = [
     lambda x, y, z: (x, z, -y),
@@ -38,13 +40,13 @@ ROTATIONS = [
 ]
 
 
-@print_calls
+@instrument
 def part1(scans):
     reference, _ = solve(scans)
     return len(reference)
 
 
-@print_calls
+@instrument
 def part2(scans):
     _, offsets = solve(scans)
     largest = 0
@@ -146,9 +148,9 @@ class frozendict(dict):
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2021, day=19)
+    data = script_input(day=19)
+
+    ans1 = part1(load(data))
+    ans2 = part2(load(data))
 
-    ans1 = part1(load(puzzle.input_data))
-    # puzzle.answer_a = ans1
-    ans2 = part2(load(puzzle.input_data))
-    # puzzle.answer_b = ans2
+    print(ans1, ans2, sep="\n")
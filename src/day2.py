@@ -1,49 +1,72 @@
 # Advent of Code 2021, Day 2
 # (c) blu3r4y
 
-from aocd.models import Puzzle
-from dotmap import DotMap
-from funcy import print_calls
-from parse import parse
+from collections import namedtuple
 
+import numpy as np
 
-@print_calls
-def part1(instructions):
-    hor, dep = 0, 0
-    for e in instructions:
-        if e.dir == "forward":
-            hor += e.num
-        elif e.dir == "down":
-            dep += e.num
-        elif e.dir == "up":
-            dep -= e.num
+from inputs import script_input
+from instrument import instrument
 
-    return hor * dep
+Commands = namedtuple("Commands", "dirs nums")
 
+# directions are identified by their first letter
+FORWARD, DOWN, UP = b"fdu"
 
-@print_calls
-def part2(instructions):
-    hor, dep, aim = 0, 0, 0
-    for e in instructions:
-        if e.dir == "forward":
-            hor += e.num
-            dep += aim * e.num
-        elif e.dir == "down":
-            aim += e.num
-        elif e.dir == "up":
-            aim -= e.num
 
-    return hor * dep
+@instrument
+def part1(commands):
+    dirs, nums = commands
+
+    hor = nums[dirs == FORWARD].sum()
+    dep = nums[dirs == DOWN].sum() - nums[dirs == UP].sum()
+
+    return int(hor * dep)
+
+
+@instrument
+def part2(commands):
+    dirs, nums = commands
+    forward = dirs == FORWARD
+
+    # aim is the running sum of downs and ups, which is applied on every forward
+    aim = np.cumsum(np.where(dirs == DOWN, nums, 0) - np.where(dirs == UP, nums, 0))
+    hor = nums[forward].sum()
+    dep = (aim[forward] * nums[forward]).sum()
+
+    return int(hor * dep)
 
 
 def load(data):
-    return [DotMap(parse("{dir:l} {num:d}", line).named) for line in data.split("\n")]
+    # parse all commands at once, without creating any objects per line
+    buf = np.frombuffer(data.replace("\r", "").strip().encode(), dtype=np.uint8)
+    spaces = np.flatnonzero(buf == ord(" "))
+    ends = np.append(np.flatnonzero(buf == ord("\n")), len(buf))
+    starts = np.insert(ends[:-1] + 1, 0, 0)
+
+    # every line is a command and a number, separated by a single space
+    if len(spaces) != len(starts) or np.any((spaces < starts) | (spaces >= ends)):
+        raise ValueError("every command needs exactly one space")
+
+    # parse numbers digit by digit, up to the longest number
+    nums = np.zeros(len(starts), dtype=np.int64)
+    lengths = ends - spaces - 1
+    if np.any(lengths < 1):
+        raise ValueError("every command needs a number")
+    for i in range(lengths.max()):
+        more = lengths > i
+        digits = buf[spaces[more] + 1 + i] - ord("0")
+        if np.any(digits > 9):
+            raise ValueError("numbers may only contain digits")
+        nums[more] = nums[more] * 10 + digits
+
+    return Commands(buf[starts], nums)
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2021, day=2)
+    data = script_input(day=2)
+
+    ans1 = part1(load(data))
+    ans2 = part2(load(data))
 
-    ans1 = part1(load(puzzle.input_data))
-    # puzzle.answer_a = ans1
-    ans2 = part2(load(puzzle.input_data))
-    # puzzle.answer_b = ans2
+    print(ans1, ans2, sep="\n")
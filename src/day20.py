@@ -3,19 +3,21 @@
 
 from collections import defaultdict, namedtuple
 
-from aocd.models import Puzzle
-from funcy import first, lmap, print_calls, second
-from tqdm.auto import tqdm
+from funcy import first, lmap, second
+
+from inputs import script_input
+from instrument import instrument
+from progress import tqdm
 
 Input = namedtuple("Input", "image lookup")
 
 
-@print_calls
+@instrument
 def part1(data):
     return solve(data, 2)
 
 
-@print_calls
+@instrument
 def part2(data):
     return solve(data, 50)
 
@@ -83,9 +85,9 @@ def load(data):
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2021, day=20)
+    data = script_input(day=20)
+
+    ans1 = part1(load(data))
+    ans2 = part2(load(data))
 
-    ans1 = part1(load(puzzle.input_data))
-    # puzzle.answer_a = ans1
-    ans2 = part2(load(puzzle.input_data))
-    # puzzle.answer_b = ans2
+    print(ans1, ans2, sep="\n")
@@ -5,14 +5,16 @@ from collections import namedtuple
 from functools import cache
 from itertools import count, cycle, product
 
-from aocd.models import Puzzle
-from funcy import collecting, print_calls, take
+from funcy import collecting, take
 from parse import parse
 
+from inputs import script_input
+from instrument import instrument
+
 State = namedtuple("State", "p1 p2 s1 s2 turn")
 
 
-@print_calls
+@instrument
 def part1(pos, min_score=1000):
     state = State(*pos, 0, 0, 0)
     die = cycle(range(1, 100 + 1))
@@ -30,7 +32,7 @@ def part1(pos, min_score=1000):
     return other * 3 * turn
 
 
-@print_calls
+@instrument
 def part2(pos, min_score=21):
     state = State(*pos, 0, 0, 0)
     u1, u2 = play(state, min_score)
@@ -90,9 +92,9 @@ def load(data):
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2021, day=21)
+    data = script_input(day=21)
+
+    ans1 = part1(load(data))
+    ans2 = part2(load(data))
 
-    ans1 = part1(load(puzzle.input_data))
-    # puzzle.answer_a = ans1
-    ans2 = part2(load(puzzle.input_data))
-    # puzzle.answer_b = ans2
+    print(ans1, ans2, sep="\n")
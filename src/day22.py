@@ -4,14 +4,13 @@
 from itertools import permutations
 
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from aocd.models import Puzzle
-from funcy import print_calls
 from parse import parse
 
+from inputs import script_input
+from instrument import instrument
 
-@print_calls
+
+@instrument
 def part1(steps):
     grid = np.zeros((101, 101, 101), dtype=int)
 
@@ -29,7 +28,7 @@ def part1(steps):
     return grid.sum()
 
 
-@print_calls
+@instrument
 def part2(steps, plot=False):
     cubeset = CubeSet()
 
@@ -152,6 +151,10 @@ class CubeSet:
         return xcnt and ycnt and zcnt
 
     def plot(self):
+        # plotly is only needed for plotting, which is slow to import
+        import plotly.express as px
+        import plotly.graph_objects as go
+
         objects = []
         colors = px.colors.qualitative.Plotly
         for i, cube in enumerate(self.oncubes):
@@ -206,9 +209,9 @@ def load(data):
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2021, day=22)
+    data = script_input(day=22)
+
+    ans1 = part1(load(data))
+    ans2 = part2(load(data), plot=False)
 
-    ans1 = part1(load(puzzle.input_data))
-    # puzzle.answer_a = ans1
-    ans2 = part2(load(puzzle.input_data), plot=False)
-    # puzzle.answer_b = ans2
+    print(ans1, ans2, sep="\n")
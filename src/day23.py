@@ -1,8 +1,8 @@
 from queue import PriorityQueue
 
-from aocd.models import Puzzle
-from funcy import print_calls
-from tqdm.auto import tqdm
+from inputs import script_input
+from instrument import instrument
+from progress import tqdm
 
 # amphipods and their energy levels
 AMPHIPODS = ("A", "B", "C", "D")
@@ -19,12 +19,12 @@ ILLEGAL_STOPS = (2, 4, 6, 8)
 TROOM, THALLWAY = 0, 1
 
 
-@print_calls
+@instrument
 def part1(state, debug=False):
     return solve(state, debug)
 
 
-@print_calls
+@instrument
 def part2(state, debug=False):
     # mutate state to include two new room levels
     ro = list(state.rooms)
@@ -414,9 +414,9 @@ def load(data):
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2021, day=23)
+    data = script_input(day=23)
 
-    ans1 = part1(load(puzzle.input_data), debug=True)
-    # puzzle.answer_a = ans1
-    ans2 = part2(load(puzzle.input_data), debug=True)
-    # puzzle.answer_b = ans2
+    ans1 = part1(load(data), debug=True)
+    ans2 = part2(load(data), debug=True)
+
+    print(ans1, ans2, sep="\n")
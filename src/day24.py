@@ -1,13 +1,15 @@
 # Advent of Code 2021, Day 24
 # (c) blu3r4y
 
-from aocd.models import Puzzle
-from funcy import collecting, print_calls
+from funcy import collecting
+
+from inputs import script_input
+from instrument import instrument
 
 NUMBER_LENGTH = 14
 
 
-@print_calls
+@instrument
 def part1(instructions):
     inp = [9] * NUMBER_LENGTH
 
@@ -23,7 +25,7 @@ def part1(instructions):
     return "".join(map(str, inp))
 
 
-@print_calls
+@instrument
 def part2(instructions):
     inp = [1] * NUMBER_LENGTH
 
@@ -140,9 +142,9 @@ def load(data):
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2021, day=24)
+    data = script_input(day=24)
+
+    ans1 = part1(load(data))
+    ans2 = part2(load(data))
 
-    ans1 = part1(load(puzzle.input_data))
-    # puzzle.answer_a = ans1
-    ans2 = part2(load(puzzle.input_data))
-    # puzzle.answer_b = ans2
+    print(ans1, ans2, sep="\n")
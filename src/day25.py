@@ -4,14 +4,16 @@
 from itertools import count
 
 import numpy as np
-from aocd.models import Puzzle
-from funcy import print_calls, remove
+from funcy import remove
+
+from inputs import script_input
+from instrument import instrument
 
 # identifies '.', '>', 'v'
 FREE, EAST, SOUTH = 0, 1, 2
 
 
-@print_calls
+@instrument
 def part1(grid):
     for i in count(1):
         n1 = move_char(grid, EAST)
@@ -54,7 +56,8 @@ def load(data):
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2021, day=25)
+    data = script_input(day=25)
+
+    ans1 = part1(load(data))
 
-    ans1 = part1(load(puzzle.input_data))
-    # puzzle.answer_a = ans1
+    print(ans1)
@@ -1,66 +1,73 @@
 # Advent of Code 2021, Day 3
 # (c) blu3r4y
 
+from collections import namedtuple
 from functools import partial
 
 import numpy as np
-from aocd.models import Puzzle
-from funcy import print_calls, remove
 
+from inputs import script_input, script_stream
+from instrument import instrument
 
-@print_calls
-def part1(data):
-    gamma, epsilon = "", ""
+Report = namedtuple("Report", "values width")
 
-    n = data.shape[0]
-    for pos in range(n):
-        bit = most_common(*count_bits(data, pos))
-        gamma += str(bit)
 
-    # this is just the binary inverse then
-    epsilon = gamma.translate(gamma.maketrans("01", "10"))
+@instrument
+def part1(report):
+    values, width = report
+    gamma = 0
+
+    # most common bits, from the most significant one
+    for pos in reversed(range(width)):
+        bit = most_common(*count_bits(values, pos))
+        assert bit is not None, f"no most common bit at position {pos}"
+        gamma = (gamma << 1) | bit
 
-    gamma = int(gamma, 2)
-    epsilon = int(epsilon, 2)
+    # this is just the binary inverse then
+    epsilon = ~gamma & ((1 << width) - 1)
 
     return epsilon * gamma
 
 
-@print_calls
-def part2(data):
-    oxy = filter_values(data, criteria=partial(most_common, tie=1))
-    co2 = filter_values(data, criteria=partial(least_common, tie=0))
+@instrument
+def part2(report):
+    values, width = report
+    values = np.sort(values)
+
+    oxy = filter_values(values, width, criteria=partial(most_common, tie=1))
+    co2 = filter_values(values, width, criteria=partial(least_common, tie=0))
 
     return oxy * co2
 
 
-def filter_values(arr, criteria):
-    tmp = arr.copy()
-    pos = 0
+def filter_values(values, width, criteria):
+    # in sorted order, values with a common prefix form a contiguous range,
+    # which a binary search splits by the next bit in O(log n)
+    lo, hi = 0, len(values)
+    prefix = 0
 
     # iterate until there is only one element left
-    while tmp.shape[1] > 1:
-        assert pos < tmp.shape[0]
-
-        n, p = count_bits(tmp, pos)
-        bit = criteria(n, p)
-
-        # filter rows by bit set in column
-        mask = tmp[pos, :] == bit
-        tmp = tmp[:, mask]
+    for pos in reversed(range(width)):
+        if hi - lo == 1:
+            break
 
-        pos += 1
+        # index of the first value in range with this bit set
+        ones = np.uint64(prefix | (1 << pos))
+        mid = lo + int(np.searchsorted(values[lo:hi], ones))
+        bit = criteria(mid - lo, hi - mid)
 
-    # map binary array back to integer
-    result = tmp[:, 0]
-    result = int("".join(map(str, result)), 2)
+        # keep the range with the bit set in column
+        prefix |= bit << pos
+        lo, hi = (lo, mid) if bit == 0 else (mid, hi)
+        assert lo < hi, f"no values left at position {pos}"
 
-    return result
+    assert hi - lo == 1
+    return int(values[lo])
 
 
-def count_bits(arr, pos):
-    n = np.sum(arr[pos, :] == 0)
-    p = np.sum(arr[pos, :] == 1)
+def count_bits(values, pos):
+    p = int(np.count_nonzero((values >> np.uint64(pos)) & np.uint64(1)))
+    n = len(values) - p
     return n, p
 
 
@@ -76,15 +83,66 @@ def least_common(x, y, tie=None):
     return 1 if x > y else 0
 
 
+def count_columns(chunks):
+    # count the ones per column over chunks of bit matrices, of any width
+    ones, n = None, 0
+    for bits in chunks:
+        if ones is None:
+            ones = np.zeros(bits.shape[1], dtype=np.int64)
+
+        ones += bits.sum(axis=0, dtype=np.int64)
+        n += len(bits)
+
+    if ones is None:
+        raise ValueError("no diagnostic report to count")
+
+    return ones, n
+
+
+def power_rates(ones, n):
+    # most common bits, packed into a big integer without string conversions
+    assert np.all(2 * ones != n), "no most common bit in some column"
+    width = len(ones)
+    packed = np.packbits(2 * ones > n).tobytes()
+    gamma = int.from_bytes(packed, "big") >> (-width % 8)
+
+    # this is just the binary inverse then
+    epsilon = ~gamma & ((1 << width) - 1)
+
+    return gamma, epsilon
+
+
+def parse(data):
+    # parse into a 2d matrix of bits, without the line breaks
+    data = data.strip() + "\n"
+    width = data.index("\n")
+    bits = np.frombuffer(data.encode(), dtype=np.uint8).reshape(-1, width + 1)
+    return bits[:, :width] - ord("0")
+
+
 def load(data):
-    # parse into a 2d matrix of integers
-    return np.fromiter(remove("\n", data), dtype=int).reshape(-1, data.index("\n")).T
+    bits = parse(data)
+    width = bits.shape[1]
+    assert width <= 64, f"reports with {width} bits do not fit into 64 bits"
 
+    # pack the bits of every row into a single unsigned integer
+    packed = np.zeros((len(bits), 8), dtype=np.uint8)
+    packed[:, : (width + 7) // 8] = np.packbits(bits, axis=1)
+    values = packed.view(">u8").ravel().astype(np.uint64) >> np.uint64(64 - width)
 
-if __name__ == "__main__":
-    puzzle = Puzzle(year=2021, day=3)
+    return Report(values, width)
 
-    ans1 = part1(load(puzzle.input_data))
-    # puzzle.answer_a = ans1
-    ans2 = part2(load(puzzle.input_data))
-    # puzzle.answer_b = ans2
+
+if __name__ == "__main__":
+    chunks = script_stream(parse)
+    if chunks is not None:
+        # stream reports of any width from stdin, but only solve the first part
+        gamma, epsilon = power_rates(*count_columns(chunks))
+        print(gamma * epsilon)
+    else:
+        data = script_input(day=3)
+
+        ans1 = part1(load(data))
+        ans2 = part2(load(data))
+
+        print(ans1, ans2, sep="\n")
@@ -1,73 +1,109 @@
 # Advent of Code 2021, Day 4
 # (c) blu3r4y
 
+from collections import defaultdict
+
 import numpy as np
 import numpy.ma as ma
-from aocd.models import Puzzle
-from funcy import lmap, print_calls
+from funcy import lmap
+
+from inputs import script_input
+from instrument import instrument
 
 BOARD_SHAPE = 5
 
 
-@print_calls
+@instrument
 def part1(draws, boards):
-    return bingo(draws, boards)
+    times, scores = win_scores(draws, boards)
+    return scores[np.argmin(times)]
 
 
-@print_calls
+@instrument
 def part2(draws, boards):
-    return bingo(draws, boards, first_winner=False)
+    times, scores = win_scores(draws, boards)
 
+    # the last board to win, where boards that never win do not count
+    times = np.where(times < len(draws), times, -1)
+    return scores[len(times) - 1 - np.argmax(times[::-1])]
 
-def bingo(draws, boards, first_winner=True):
-    num_boards = len(boards)
 
-    # allocate an empty mask for each board
-    masks = [np.zeros_like(boards[0], dtype=bool) for _ in range(num_boards)]
+def win_scores(draws, boards):
+    # the turn at which every board wins and its score then, without replaying
+    # the game - a board that never wins gets len(draws) as its turn and scores 0
+    draws = np.asarray(draws)
+    times, ranks = win_times(draws, boards)
 
-    # index of winning boards in order
-    winners = []
+    unmarked = np.sum(boards * (ranks > times[:, None, None]), axis=(1, 2))
+    called = np.append(draws, 0)[times]
 
-    draw = None
-    for draw in draws:
+    return times, unmarked * called
 
-        # (1) mask boards
-        for i in range(num_boards):
-            masks[i] = mask_board(boards[i], masks[i], draw)
 
-        # (2) search winners
-        for i in range(num_boards):
-            if i not in winners and has_won(masks[i]):
-                winners.append(i)
+def win_times(draws, boards):
+    # the turn at which each number is drawn first, or never, with a lookup
+    # in the sorted numbers that were drawn, no matter how large they are
+    numbers, first = np.unique(draws, return_index=True)
+    i = np.minimum(np.searchsorted(numbers, boards), len(numbers) - 1)
+    ranks = np.where(numbers[i] == boards, first[i], len(draws))
 
-                # immediate return if we only search the first winner
-                if first_winner:
-                    return score(boards[i], masks[i], draw)
+    # a line is complete when its last number is drawn,
+    # and a board wins with its first completed line
+    rows = ranks.max(axis=2).min(axis=1)
+    cols = ranks.max(axis=1).min(axis=1)
 
-        # (3) stop entire game if all players won
-        if len(winners) == num_boards:
-            break
+    return np.minimum(rows, cols), ranks
+
+
+def bingo(draws, boards, first_winner=True):
+    order = winners(draws, boards)
+    assert order, "no board wins"
+
+    board, turn = order[0] if first_winner else order[-1]
+    return score(boards[board], draws[: turn + 1])
 
-    # alternative routine for part 2 - where we output the last winner score
-    assert not first_winner
-    last = winners[-1]
-    return score(boards[last], masks[last], draw)
 
+def winners(draws, boards):
+    # index of every cell by its number, so that a draw only touches the cells
+    # that contain it, and hit counters for every row and column of each board
+    index = defaultdict(list)
+    for b, board in enumerate(boards):
+        for r, row in enumerate(board.tolist()):
+            for c, num in enumerate(row):
+                index[num].append((b, r, c))
 
-def mask_board(board, mask, draw):
-    return np.logical_or(mask, (board == draw))
+    rows = [[0] * BOARD_SHAPE for _ in boards]
+    cols = [[0] * BOARD_SHAPE for _ in boards]
 
+    # index of winning boards and the turn they won, in order
+    won = [False] * len(boards)
+    order = []
 
-def has_won(mask):
-    col = any(mask.sum(axis=0) == BOARD_SHAPE)
-    row = any(mask.sum(axis=1) == BOARD_SHAPE)
-    return row or col
+    seen = set()
+    for turn, draw in enumerate(draws):
+        if draw in seen:
+            continue
+        seen.add(draw)
 
+        for b, r, c in index.get(draw, ()):
+            rows[b][r] += 1
+            cols[b][c] += 1
 
-def score(board, mask, draw):
-    masked = ma.masked_array(board, mask)
+            if not won[b] and BOARD_SHAPE in (rows[b][r], cols[b][c]):
+                won[b] = True
+                order.append((b, turn))
+
+        # stop entire game if all players won
+        if len(order) == len(boards):
+            break
+
+    return order
+
+
+def score(board, drawn):
+    masked = ma.masked_array(board, np.isin(board, drawn))
     unmarked = masked.sum()
-    return unmarked * draw
+    return unmarked * drawn[-1]
 
 
 def load(data):
@@ -77,16 +113,18 @@ def load(data):
     for i in range(2, len(lines), BOARD_SHAPE + 1):
         board = lines[i : (i + BOARD_SHAPE)]
         board = [lmap(int, row.split()) for row in board]
-        board = np.array(board, dtype=int)
         boards.append(board)
 
+    # stack all boards into a single (boards, 5, 5) tensor
+    boards = np.array(boards, dtype=int)
+
     return draws, boards
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2021, day=4)
+    data = script_input(day=4)
+
+    ans1 = part1(*load(data))
+    ans2 = part2(*load(data))
 
-    ans1 = part1(*load(puzzle.input_data))
-    # puzzle.answer_a = ans1
-    ans2 = part2(*load(puzzle.input_data))
-    # puzzle.answer_b = ans2
+    print(ans1, ans2, sep="\n")
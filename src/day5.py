@@ -1,68 +1,245 @@
 # Advent of Code 2021, Day 5
 # (c) blu3r4y
 
-from collections import defaultdict
-
-from aocd.models import Puzzle
-from dotmap import DotMap
-from funcy import print_calls
-from parse import parse
-
-
-@print_calls
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter, defaultdict
+from itertools import combinations
+
+import numpy as np
+
+from inputs import script_input
+from instrument import instrument
+
+# canvases with more cells are counted analytically instead
+DENSE_LIMIT = 2**24
+
+# horizontal, vertical, diagonal and anti-diagonal segments are
+# given by a constant key and a range along the line
+ORIENTATIONS = {
+    "h": (lambda x, y: y, lambda x, y: x),
+    "v": (lambda x, y: x, lambda x, y: y),
+    "d": (lambda x, y: x - y, lambda x, y: x),
+    "a": (lambda x, y: x + y, lambda x, y: x),
+}
+
+# frames (p, q) where the first orientation has a constant p and the second one
+# a constant q, together with the inverse transformation back to (x, y)
+FRAMES = {
+    "hv": (lambda x, y: (y, x), lambda p, q: (q, p)),
+    "hd": (lambda x, y: (y, x - y), lambda p, q: (p + q, p)),
+    "ha": (lambda x, y: (y, x + y), lambda p, q: (q - p, p)),
+    "vd": (lambda x, y: (x, x - y), lambda p, q: (p, p - q)),
+    "va": (lambda x, y: (x, x + y), lambda p, q: (p, q - p)),
+    "da": (lambda x, y: (x - y, x + y), lambda p, q: ((p + q) // 2, (q - p) // 2)),
+}
+
+
+@instrument
 def part1(data):
     return solve(data)
 
 
-@print_calls
+@instrument
 def part2(data):
     return solve(data, diagonal=True)
 
 
 def solve(data, diagonal=False):
-    canvas = defaultdict(set)
+    x1, y1, x2, y2 = data.T
+
+    lines = (x1 == x2) | (y1 == y2)
+    if diagonal:
+        lines |= np.abs(x2 - x1) == np.abs(y2 - y1)
+
+    segments = data[lines]
+    if len(segments) == 0:
+        return 0
+
+    # move the segments to the origin of the canvas
+    x0, y0 = segments[:, ::2].min(), segments[:, 1::2].min()
+    segments = segments - np.array([x0, y0, x0, y0])
+    width, height = segments[:, ::2].max() + 1, segments[:, 1::2].max() + 1
+    if width * height > DENSE_LIMIT:
+        return sweep(segments)
+
+    canvas = rasterize(segments, width, height)
+    return int(np.count_nonzero(canvas > 1))
+
+
+def rasterize(segments, width, height):
+    # count the lines on every cell of the canvas, with one or two bytes per cell
+    # and without listing their points, by summing up difference arrays
+    x1, y1, x2, y2 = segments.T
+    xlo, xhi = np.minimum(x1, x2), np.maximum(x1, x2)
+    ylo, yhi = np.minimum(y1, y2), np.maximum(y1, y2)
+
+    vertical = x1 == x2
+    horizontal = (y1 == y2) & ~vertical
+    diagonal = (x2 - x1 == y2 - y1) & ~vertical
+    anti = ~(vertical | horizontal | diagonal)
+
+    # a signed type that holds both -n and +n for n lines
+    dtype = np.min_scalar_type(-(len(segments) + 1))
+    canvas = np.zeros((height, width), dtype=dtype)
+
+    # vertical lines are stripes along the columns
+    v = vertical
+    canvas += stripes(height, width, x1[v], ylo[v], yhi[v], dtype)
+
+    # horizontal lines are stripes along the columns of the transposed canvas
+    h = horizontal
+    canvas += stripes(width, height, y1[h], xlo[h], xhi[h], dtype).T
+
+    # diagonals are stripes along the columns of a canvas, where row y is shifted
+    # by y cells, such that cell (x, y) is at column x - y + height - 1 ...
+    skewed = width + height - 1
+    d = diagonal
+    columns = x1[d] - y1[d] + height - 1
+    strip = stripes(height, skewed, columns, ylo[d], yhi[d], dtype).ravel()
+    canvas += as_strided(strip[height - 1 :], (height, width), (skewed - 1, 1), dtype)
+
+    # ... and for anti-diagonals at column x + y
+    a = anti
+    strip = stripes(height, skewed, x1[a] + y1[a], ylo[a], yhi[a], dtype).ravel()
+    canvas += as_strided(strip, (height, width), (skewed + 1, 1), dtype)
+
+    return canvas
+
+
+def stripes(height, width, columns, lo, hi, dtype):
+    # count stripes from row lo to hi on the given columns, by marking their ends
+    # in a difference array, which is then summed up along the columns
+    diff = np.zeros((height + 1) * width, dtype=dtype)
+    np.add.at(diff, lo * width + columns, dtype.type(1))
+    np.add.at(diff, (hi + 1) * width + columns, dtype.type(-1))
+
+    diff = diff.reshape(height + 1, width)
+    return np.cumsum(diff, axis=0, dtype=dtype, out=diff)[:-1]
+
+
+def as_strided(arr, shape, strides, dtype):
+    # strides are given in elements, not in bytes
+    strides = tuple(s * dtype.itemsize for s in strides)
+    return np.lib.stride_tricks.as_strided(arr, shape, strides, writeable=False)
+
+
+def sweep(segments):
+    # count overlaps analytically, so that it scales with the number of segments
+    # and overlaps, but not with the area that they cover
+    lines = defaultdict(list)
+    for x1, y1, x2, y2 in segments.tolist():
+        if y1 == y2:
+            lines["h"].append((x1, y1, x2, y2))
+        elif x1 == x2:
+            lines["v"].append((x1, y1, x2, y2))
+        elif x2 - x1 == y2 - y1:
+            lines["d"].append((x1, y1, x2, y2))
+        else:
+            lines["a"].append((x1, y1, x2, y2))
+
+    # (1) ranges that are covered by collinear segments
+    overlaps = {o: collinear_overlaps(lines[o], *ORIENTATIONS[o]) for o in "hvda"}
+    num_overlaps = sum(
+        hi - lo + 1
+        for ranges in overlaps.values()
+        for starts, stops in ranges.values()
+        for lo, hi in zip(starts, stops)
+    )
+
+    # (2) points where segments of different orientation cross
+    points = set()
+    for first, second in combinations("hvda", 2):
+        forward, inverse = FRAMES[first + second]
+        for p, q in crossings(lines[first], lines[second], forward):
+            # diagonals may cross in between two points of the grid
+            if first + second != "da" or (p + q) % 2 == 0:
+                points.add(inverse(p, q))
+
+    # (3) crossings that are not covered by collinear overlaps add up, but
+    # collinear overlaps of different orientations must only count once
+    for x, y in points:
+        covered = sum(
+            covers(overlaps[o], key(x, y), pos(x, y))
+            for o, (key, pos) in ORIENTATIONS.items()
+        )
+        num_overlaps += 1 if covered == 0 else 1 - covered
 
-    for no, e in enumerate(data):
-        if e.x1 == e.x2:
-            draw_orthogonal(no, e.x1, e.y1, e.y2, canvas)
-        elif e.y1 == e.y2:
-            draw_orthogonal(no, e.y1, e.x1, e.x2, canvas, swap=True)
-        elif diagonal:
-            draw_diagonal(no, e.x1, e.y1, e.x2, e.y2, canvas)
-
-    num_overlaps = sum([len(pt) > 1 for pt in canvas.values()])
     return num_overlaps
 
 
-def draw_orthogonal(i, x, y1, y2, canvas, swap=False):
-    y1, y2 = sorted((y1, y2))
-    for yn in range(y1, y2 + 1):
-        point = (x, yn) if not swap else (yn, x)
-        canvas[point].add(i)
-
-
-def draw_diagonal(i, x1, y1, x2, y2, canvas):
-    x, y = x1, y1
-    while x != x2 and y != y2:
-        canvas[(x, y)].add(i)
-
-        x += 1 if x < x2 else -1
-        y += 1 if y < y2 else -1
-
-    canvas[(x2, y2)].add(i)
+def collinear_overlaps(lines, key, pos):
+    # ranges on each line that are covered by at least two segments, ordered
+    # and disjoint, as a mapping from the line key to their starts and stops
+    segments = []
+    for x1, y1, x2, y2 in lines:
+        lo, hi = sorted((pos(x1, y1), pos(x2, y2)))
+        segments.append((key(x1, y1), lo, hi))
+
+    overlaps = defaultdict(lambda: ([], []))
+    reach = {}
+
+    for k, lo, hi in sorted(segments):
+        end = reach.get(k)
+        if end is not None and lo <= end:
+            starts, stops = overlaps[k]
+            stop = min(hi, end)
+            if starts and lo <= stops[-1] + 1:
+                stops[-1] = max(stops[-1], stop)
+            else:
+                starts.append(lo)
+                stops.append(stop)
+
+        reach[k] = hi if end is None else max(end, hi)
+
+    return dict(overlaps)
+
+
+def covers(ranges, key, pos):
+    if key not in ranges:
+        return False
+
+    starts, stops = ranges[key]
+    i = bisect_right(starts, pos) - 1
+    return i >= 0 and pos <= stops[i]
+
+
+def crossings(first, second, forward):
+    # sweep along q over segments with a constant p (first) and segments with
+    # a constant q (second), keeping the p values of all active segments ordered
+    events = []
+    for x1, y1, x2, y2 in first:
+        (p, qa), (_, qb) = forward(x1, y1), forward(x2, y2)
+        events.append((min(qa, qb), 0, p, p))
+        events.append((max(qa, qb), 2, p, p))
+
+    for x1, y1, x2, y2 in second:
+        (pa, q), (pb, _) = forward(x1, y1), forward(x2, y2)
+        events.append((q, 1, min(pa, pb), max(pa, pb)))
+
+    active, counts = [], Counter()
+    for q, kind, lo, hi in sorted(events):
+        if kind == 0:
+            if not counts[lo]:
+                insort(active, lo)
+            counts[lo] += 1
+        elif kind == 2:
+            counts[lo] -= 1
+            if not counts[lo]:
+                del active[bisect_left(active, lo)]
+        else:
+            for p in active[bisect_left(active, lo) : bisect_right(active, hi)]:
+                yield p, q
 
 
 def load(data):
-    return [
-        DotMap(parse("{x1:d},{y1:d} -> {x2:d},{y2:d}", line).named)
-        for line in data.split("\n")
-    ]
+    data = data.replace(" -> ", ",").replace("\n", ",")
+    return np.fromstring(data, dtype=np.int64, sep=",").reshape(-1, 4)
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2021, day=5)
+    data = script_input(day=5)
+
+    ans1 = part1(load(data))
+    ans2 = part2(load(data))
 
-    ans1 = part1(load(puzzle.input_data))
-    # puzzle.answer_a = ans1
-    ans2 = part2(load(puzzle.input_data))
-    # puzzle.answer_b = ans2
+    print(ans1, ans2, sep="\n")
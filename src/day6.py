@@ -1,40 +1,121 @@
 # Advent of Code 2021, Day 6
 # (c) blu3r4y
 
-from aocd.models import Puzzle
-from funcy import lmap, print_calls
+import numpy as np
+from funcy import lmap
 
+from inputs import script_input
+from instrument import instrument
 
-@print_calls
+TIMERS = 9
+
+# fish with timer i have timer i - 1 on the next day, but fish with timer 0
+# reset to 6 and give birth to a fish with timer 8, i.e., new = TRANSITION @ old
+TRANSITION = [[int(j == i + 1) for j in range(TIMERS)] for i in range(TIMERS)]
+TRANSITION[6][0] = TRANSITION[8][0] = 1
+
+INT_LIMIT = np.iinfo(np.int64).max
+
+
+@instrument
 def part1(data, days=80):
-    for _ in range(days):
-        zeros = data.count(0)
-        data = [6 if e == 0 else (e - 1) for e in data]
-        data.extend([8] * zeros)
-    return len(data)
+    return sum(evolve([histogram(data)], [days])[0])
 
 
-@print_calls
+@instrument
 def part2(data, days=256):
-    # this does the same as day 1, but in linear time
+    return sum(evolve([histogram(data)], [days])[0])
 
-    # denote initial birth frequencies
-    births = [0] * 9
-    for d in data:
-        births[d] += 1
+
+def evolve(states, days):
+    # timer histograms after the given number of days for many initial states at
+    # once, in O(log days) by applying a square of the transition matrix for every
+    # bit of the days - python integers keep this exact for any number of days
+    states = [list(state) for state in states]
+
+    square = TRANSITION
+    for bit in range(max(days, default=0).bit_length()):
+        for state, n in zip(states, days):
+            if n >> bit & 1:
+                state[:] = matvec(square, state)
+        square = matmul(square, square)
+
+    return states
+
+
+def simulate(counts, days):
+    # advance an (schools, 9) matrix of timer histograms by the given days
+    for counts in steps(counts, days):
+        pass
+    return counts
+
+
+def trajectory(counts, days, path):
+    # write the (days + 1, schools, 9) histograms of every day to a .npy file,
+    # and return them as a memory-mapped array
+    counts = np.asarray(counts)
+
+    # populations never shrink, so no count exceeds the final population,
+    # which we know exactly before anything is written
+    largest = max(final_populations(counts, days), default=0)
+    if largest > INT_LIMIT:
+        raise OverflowError(f"populations exceed 64 bits within {days} days")
+
+    out = np.lib.format.open_memmap(
+        path, mode="w+", dtype=np.int64, shape=(days + 1, *counts.shape)
+    )
+
+    for day, counts in enumerate(steps(counts, days)):
+        out[day] = counts
+
+    out.flush()
+    return out
+
+
+def steps(counts, days):
+    # yields the histograms of all schools for every day, including the first
+    counts = np.asarray(counts)
+    if counts.dtype != object:
+        counts = counts.astype(np.int64)
+    yield counts
 
     for _ in range(days):
-        # step through lifetime by shifting births
-        rotate_left(births)
-        # fish that are born at 8 will breed again at 6
-        births[6] += births[8]
+        # populations at most double per day, so switch to python integers
+        # before the sum of two counts could overflow
+        if counts.dtype != object and counts.max(initial=0) > INT_LIMIT // 2:
+            counts = counts.astype(object)
+
+        # step through lifetime by shifting timers,
+        # and fish that are born at 8 will breed again at 6
+        counts = np.roll(counts, -1, axis=1)
+        counts[:, 6] += counts[:, 8]
+        yield counts
 
-    return sum(births)
 
+def final_populations(counts, days):
+    # exact population of every school after the given days, by weighting its
+    # histogram with the descendants of a single fish with each timer
+    single = evolve(np.eye(TIMERS, dtype=int).tolist(), [days] * TIMERS)
+    weights = np.array([sum(state) for state in single], dtype=object)
+    return np.asarray(counts).astype(object) @ weights
 
-def rotate_left(arr):
-    # [ 1 2 3 4 ] -> [ 2 3 4 1 ]
-    arr[:-1], arr[-1] = arr[1:], arr[0]
+
+def histogram(data):
+    # denote initial timer frequencies
+    counts = [0] * TIMERS
+    for d in data:
+        counts[d] += 1
+    return counts
+
+
+def matvec(a, x):
+    return [sum(aij * xj for aij, xj in zip(row, x)) for row in a]
+
+
+def matmul(a, b):
+    return [
+        [sum(aik * bkj for aik, bkj in zip(row, col)) for col in zip(*b)] for row in a
+    ]
 
 
 def load(data):
@@ -42,9 +123,9 @@ def load(data):
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2021, day=6)
+    data = script_input(day=6)
+
+    ans1 = part1(load(data))
+    ans2 = part2(load(data))
 
-    ans1 = part1(load(puzzle.input_data))
-    # puzzle.answer_a = ans1
-    ans2 = part2(load(puzzle.input_data))
-    # puzzle.answer_b = ans2
+    print(ans1, ans2, sep="\n")
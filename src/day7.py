@@ -1,51 +1,95 @@
 # Advent of Code 2021, Day 7
 # (c) blu3r4y
 
+from collections import namedtuple
+
 import numpy as np
-from aocd.models import Puzzle
-from funcy import lmap, print_calls
+from funcy import lmap
+
+from inputs import script_input
+from instrument import instrument
 
+# sorted positions with their prefix sums, where sums[k] is the sum of the first k
+Positions = namedtuple("Positions", "sorted sums squares")
 
-@print_calls
+
+@instrument
 def part1(data):
     return solve(data, gauss=False)
 
 
-@print_calls
+@instrument
 def part2(data):
     return solve(data, gauss=True)
 
 
 def solve(data, gauss=False):
-    lo, hi = data.min(), data.max()
-    cheapest = np.inf
+    pos = positions(data)
+    n = len(pos.sorted)
+
+    if not gauss:
+        # the median minimizes the sum of l1 distances
+        return cost(pos, int(pos.sorted[n // 2]))
+
+    # the gauss cost is convex and its derivative n * (i - mean) +- n / 2
+    # vanishes within half a step of the mean, so check its neighborhood
+    mean = pos.sums[-1] / n
+    lo, hi = int(np.floor(mean)) - 1, int(np.ceil(mean)) + 1
+    return min(cost(pos, i, gauss=True) for i in range(lo, hi + 1))
+
+
+def positions(data):
+    data = np.sort(data)
+    sums = np.concatenate(([0], np.cumsum(data)))
+    return Positions(data, sums, int(np.dot(data, data)))
 
-    for i in range(lo, hi + 1):
-        fuels = np.abs(data - i)
-        if gauss:
-            # do not count l1 distance, but gauss distance
-            fuels = gauss_sum(fuels)
 
-        # find the cheapest total
-        cost = fuels.sum()
-        if cost < cheapest:
-            cheapest = cost
+def cost(pos, i, gauss=False):
+    # total fuel to align at i, in O(log n) with the prefix sums
+    n = len(pos.sorted)
+    k = int(np.searchsorted(pos.sorted, i, side="right"))
+    total = int(pos.sums[-1])
 
-    return cheapest
+    # l1 distances of crabs left and right of i
+    left = k * i - int(pos.sums[k])
+    right = (total - int(pos.sums[k])) - (n - k) * i
+    fuel = left + right
+
+    if gauss:
+        # do not count l1 distance, but gauss distance, i.e., the sum of
+        # d * (d + 1) / 2 = (d ** 2 + d) / 2 for all distances d
+        squares = pos.squares - 2 * i * total + n * i * i
+        fuel = (squares + fuel) // 2
+
+    return fuel
 
 
 def gauss_sum(n):
     return (n * (n + 1)) // 2
 
 
+def cost_curve(data, fuel=gauss_sum):
+    # total fuel for aligning at every position between the outermost crabs at
+    # once, by convolving the crab histogram with the fuel needed per distance
+    lo = data.min()
+    counts = np.bincount(data - lo)
+
+    n = len(counts)
+    distances = np.abs(np.arange(-(n - 1), n))
+    curve = np.convolve(counts, fuel(distances), mode="valid")
+
+    # the curve starts at the leftmost crab
+    return np.arange(lo, lo + n), curve
+
+
 def load(data):
     return np.array(lmap(int, data.split(",")))
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2021, day=7)
+    data = script_input(day=7)
+
+    ans1 = part1(load(data))
+    ans2 = part2(load(data))
 
-    ans1 = part1(load(puzzle.input_data))
-    # puzzle.answer_a = ans1
-    ans2 = part2(load(puzzle.input_data))
-    # puzzle.answer_b = ans2
+    print(ans1, ans2, sep="\n")
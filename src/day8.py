@@ -3,95 +3,113 @@
 
 from collections import namedtuple
 
-from aocd.models import Puzzle
-from funcy import collecting, first, lcat, lmap, lwithout, print_calls
+import numpy as np
 
-Chunk = namedtuple("Chunk", "wires display")
+from inputs import script_input, script_stream
+from instrument import instrument
 
+# segment patterns are encoded as 7-bit masks, with bit 0 for segment a
+Notes = namedtuple("Notes", "wires display")
 
-@print_calls
-def part1(chunks):
-    count = 0
-    for chunk in chunks:
-        # just count the number of appearances of digits 1, 4, 7, 8
-        # which one can identify by the number of segments
-        chunk = (1 for ch in chunk.display if len(ch) in (2, 3, 4, 7))
-        count += sum(chunk)
+SEGMENTS = (
+    "abcefg",
+    "cf",
+    "acdeg",
+    "acdfg",
+    "bcdf",
+    "abdfg",
+    "abdefg",
+    "acf",
+    "abcdefg",
+    "abcdfg",
+)
 
-    return count
+MASKS = [sum(1 << (ord(s) - ord("a")) for s in seg) for seg in SEGMENTS]
+POPCOUNT = np.array([bin(i).count("1") for i in range(128)], dtype=np.uint8)
 
 
-@print_calls
-def part2(chunks):
-    result = 0
-    for chunk in chunks:
-        code = decode(chunk)
+def signature(pattern, one, four):
+    # the number of segments, and those shared with digits 1 and 4,
+    # identify every digit, no matter how the wires are crossed
+    return (
+        POPCOUNT[pattern] * 64 + POPCOUNT[pattern & one] * 8 + POPCOUNT[pattern & four]
+    )
 
-        # decode digit by digit and sum up the result
-        num = "".join(map(str, (code[digit] for digit in chunk.display)))
-        result += int(num)
 
-    return result
+# signature of a pattern -> digit
+DIGITS = np.full(512, -1, dtype=np.int64)
+DIGITS[signature(np.array(MASKS), MASKS[1], MASKS[4])] = np.arange(10)
 
 
-def decode(chunk):
-    wires = chunk.wires
-    code = {}
+@instrument
+def part1(notes):
+    return count_easy(notes)
 
-    # extract what would must be digit 1, 4, 7, 8
-    # and remove them from the list
-    code[1] = first(w for w in wires if len(w) == 2)
-    code[4] = first(w for w in wires if len(w) == 4)
-    code[7] = first(w for w in wires if len(w) == 3)
-    code[8] = first(w for w in wires if len(w) == 7)
-    wires = lwithout(wires, *code.values())
 
-    # every remaining digit has A and G in common
-    ag = set.intersection(*wires)
+@instrument
+def part2(notes):
+    return sum_outputs(notes)
 
-    # logical identify a few segments ...
-    a = code[7] - code[1]
-    eg = code[8] - (code[4] | a)
-    bd = code[8] - code[7] - eg
-    g = ag - a
-    e = eg - g
 
-    # destruct digit 9
-    code[9] = code[8] - e
-    wires = lwithout(wires, code[9])
+def process(chunks):
+    # decode every chunk of notes once, and accumulate both answers
+    easy, total = 0, 0
+    for notes in chunks:
+        easy += count_easy(notes)
+        total += sum_outputs(notes)
 
-    # every remaining digit, that only misses 1 segment, must either be D or C
-    dc = set((lcat(e for e in (code[8] - w for w in wires) if len(e) == 1)))
+    return easy, total
 
-    # logical identify the remaining segments ...
-    d = set.intersection(dc, bd)
-    c = dc - d
-    b = bd - d
-    f = code[1] - c
 
-    # destruct digits 3, 0, 5, 6, 2
-    code[3] = code[7] | d | g
-    code[0] = code[8] - d
-    code[5] = code[8] - c - e
-    code[6] = code[8] - c
-    code[2] = code[8] - b - f
+def count_easy(notes):
+    # just count the number of appearances of digits 1, 4, 7, 8
+    # which one can identify by the number of segments
+    return int(np.isin(POPCOUNT[notes.display], (2, 3, 4, 7)).sum())
 
-    return {frozenset(v): k for k, v in code.items()}
+
+def sum_outputs(notes):
+    # decode digit by digit and sum up the result
+    digits = decode(notes)
+    return int((digits @ np.array([1000, 100, 10, 1])).sum())
+
+
+def decode(notes):
+    # digits 1 and 4 are the only patterns with 2 and 4 segments
+    rows = np.arange(len(notes.wires))
+    counts = POPCOUNT[notes.wires]
+    one = notes.wires[rows, np.argmax(counts == 2, axis=1)][:, None]
+    four = notes.wires[rows, np.argmax(counts == 4, axis=1)][:, None]
+
+    digits = DIGITS[signature(notes.display, one, four)]
+    assert np.all(digits >= 0), "invalid segment pattern"
+    return digits
 
 
-@collecting
 def load(data):
-    chunks = [line.split(" | ") for line in data.split("\n")]
-    for chunk in chunks:
-        wires = lmap(set, chunk[0].split())
-        display = lmap(frozenset, chunk[1].split())
-        yield Chunk(wires, display)
+    # one byte per segment, where spaces and line breaks separate patterns
+    text = np.frombuffer(data.strip().replace(" |", "").encode(), dtype=np.uint8)
+    letters = text >= ord("a")
+
+    # sum up the bits of all segments that belong to the same pattern
+    pattern = np.cumsum(~letters)[letters]
+    bits = np.left_shift(1, text[letters] - ord("a"))
+    masks = np.bincount(pattern, weights=bits).astype(np.uint8)
+
+    # skip empty patterns between repeated separators, then every
+    # line has 10 wired patterns and 4 display patterns
+    masks = masks[masks > 0].reshape(-1, 14)
+    return Notes(masks[:, :10], masks[:, 10:])
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2021, day=8)
+    chunks = script_stream(load)
+    if chunks is not None:
+        # stream notes of any length from stdin in constant memory
+        ans1, ans2 = process(chunks)
+    else:
+        data = script_input(day=8)
+
+        ans1 = part1(load(data))
+        ans2 = part2(load(data))
 
-    ans1 = part1(load(puzzle.input_data))
-    # puzzle.answer_a = ans1
-    ans2 = part2(load(puzzle.input_data))
-    # puzzle.answer_b = ans2
+    print(ans1, ans2, sep="\n")
@@ -1,84 +1,178 @@
 # Advent of Code 2021, Day 9
 # (c) blu3r4y
 
+import sys
+
 import numpy as np
-import numpy.ma as ma
-from aocd.models import Puzzle
-from funcy import print_calls, remove
+
+from inputs import script_input
+from instrument import instrument
+
+BOUNDARY = 9
 
 
-@print_calls
+@instrument
 def part1(heightmap):
     mask = lowest_points(heightmap)
-    risk_levels = ma.masked_array(heightmap + 1, ~mask)
-    return risk_levels.sum()
+    return int((heightmap[mask] + 1).sum())
 
 
-@print_calls
+@instrument
 def part2(heightmap):
     mask = lowest_points(heightmap)
-    coords = np.argwhere(mask == True)
+    labels = label_basins(heightmap)
 
-    sizes = []
-    for x, y in coords:
-        basin = search_basins(heightmap, x, y)
-        sizes.append(basin.sum())
+    # every lowest point is part of the basin with its label
+    sizes = np.bincount(labels[heightmap.ravel() != BOUNDARY], minlength=labels.size)
+    sizes = sizes[labels[mask.ravel()]]
 
     # multiply three largest basins
-    a, b, c = sorted(sizes)[-3:]
+    a, b, c = np.sort(sizes)[-3:].tolist()
     return a * b * c
 
 
-def search_basins(heightmap, x, y):
-    # the target point is part of the basin already
-    mask = np.zeros_like(heightmap).astype(bool)
-    mask[x, y] = True
-    visited = {(x, y)}
-
-    # recursive flood fill
-    def _fill(_x, _y, BOUNDARY=9):
-        indexes = [xy for xy in adjacent(_x, _y, heightmap.shape) if xy not in visited]
-        for (ix, iy) in indexes:
-            visited.add((ix, iy))
-            if heightmap[ix, iy] != BOUNDARY:
-                mask[ix, iy] = True
-                _fill(ix, iy)
-
-    _fill(x, y)
-    return mask
+def tiled(path, band=1024):
+    # solve both parts for a heightmap file that may not fit into memory, by
+    # reading bands of rows from a memory-mapped file, labeling basins per band
+    # and merging basins across the seams between bands with a union-find
+    with open(path, "rb") as fp:
+        width = len(fp.readline().rstrip(b"\n"))
+
+    raw = np.memmap(path, dtype=np.uint8, mode="r")
+    rows = (raw.size + 1) // (width + 1)
+    grid = np.lib.stride_tricks.as_strided(raw, (rows, width), (width + 1, 1))
+
+    risk = 0
+    parents = {}
+    basins, sizes, lows = [], [], []
+    seam = None
+
+    for r0 in range(0, rows, band):
+        r1 = min(r0 + band, rows)
+
+        # lowest points need a halo of one row above and below the band
+        lo, hi = max(r0 - 1, 0), min(r1 + 1, rows)
+        block = np.asarray(grid[lo:hi]) - ord("0")
+        heights = block[r0 - lo : r1 - lo]
+        mask = lowest_points(block)[r0 - lo : r1 - lo]
+        risk += int((heights[mask] + 1).sum())
+
+        # label basins within the band, with globally unique labels
+        labels = label_basins(heights) + r0 * width
+        inside = heights.ravel() != BOUNDARY
+        roots, counts = np.unique(labels[inside], return_counts=True)
+        basins.append(roots)
+        sizes.append(counts)
+        lows.append(labels[mask.ravel()])
+
+        # merge basins that touch the last row of the previous band
+        if seam is not None:
+            touching = (seam != -1) & inside[:width]
+            for a, b in zip(seam[touching].tolist(), labels[:width][touching].tolist()):
+                union(parents, a, b)
+
+        seam = np.where(inside[-width:], labels[-width:], -1)
+
+    # sum up the sizes of merged basins
+    basins, sizes, lows = map(np.concatenate, (basins, sizes, lows))
+    roots, inverse = np.unique(resolve(parents, basins), return_inverse=True)
+    totals = np.bincount(inverse, weights=sizes).astype(np.int64)
+
+    # every lowest point is part of the basin with its label
+    low_sizes = totals[np.searchsorted(roots, resolve(parents, lows))]
+    a, b, c = np.sort(low_sizes)[-3:].tolist()
+
+    return risk, a * b * c
+
+
+def resolve(parents, labels):
+    # map an array of labels to the roots of their merged basins
+    if not parents:
+        return labels
+
+    keys = np.array(sorted(parents), dtype=np.int64)
+    roots = np.array([find(parents, k) for k in keys.tolist()], dtype=np.int64)
+    i = np.minimum(np.searchsorted(keys, labels), len(keys) - 1)
+    return np.where(keys[i] == labels, roots[i], labels)
+
+
+def find(parents, x):
+    # find the root of x, while halving the path to it
+    while parents.get(x, x) != x:
+        parents[x] = parents.get(parents[x], parents[x])
+        x = parents[x]
+    return x
+
+
+def union(parents, a, b):
+    a, b = find(parents, a), find(parents, b)
+    if a != b:
+        parents[max(a, b)] = min(a, b)
+
+
+def label_basins(heightmap):
+    # label all connected cells that are not a boundary in one pass with a
+    # vectorized union-find, where every cell of a basin ends up pointing to
+    # the smallest flat index within that basin
+    index = np.arange(heightmap.size).reshape(heightmap.shape)
+    inside = heightmap != BOUNDARY
+
+    # edges between horizontal and vertical neighbours within a basin
+    right = inside[:, :-1] & inside[:, 1:]
+    down = inside[:-1, :] & inside[1:, :]
+    a = np.concatenate((index[:, :-1][right], index[:-1, :][down]))
+    b = np.concatenate((index[:, 1:][right], index[1:, :][down]))
+
+    parent = index.ravel().copy()
+    while True:
+        # only keep edges between different roots
+        ra, rb = parent[a], parent[b]
+        split = ra != rb
+        if not split.any():
+            break
+        a, b, ra, rb = a[split], b[split], ra[split], rb[split]
+
+        # hook the larger root below the smaller one
+        np.minimum.at(parent, np.maximum(ra, rb), np.minimum(ra, rb))
+
+        # and compress paths until every cell points to its root
+        while True:
+            grand = parent[parent]
+            if np.array_equal(grand, parent):
+                break
+            parent = grand
+
+    return parent
 
 
 def lowest_points(heightmap):
-    shape = heightmap.shape
-    mask = np.zeros_like(heightmap).astype(bool)
+    # compare with all four neighbours at once, where the border is never lower
+    padded = np.pad(heightmap, 1, constant_values=BOUNDARY + 1)
+    center = padded[1:-1, 1:-1]
 
-    for x, y in np.ndindex(shape):
-        pt = heightmap[x, y]
-        ix = adjacent(x, y, shape)
-        vl = [heightmap[i] for i in ix]
-
-        # identify local minimum
-        if all(v > pt for v in vl):
-            mask[x, y] = True
-
-    return mask
-
-
-def adjacent(x, y, shape):
-    # get neighbours without diagonals and without out of bounds access
-    adj = ((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y))
-    return ((a, b) for a, b in adj if 0 <= a < shape[0] and 0 <= b < shape[1])
+    return (
+        (center < padded[:-2, 1:-1])
+        & (center < padded[2:, 1:-1])
+        & (center < padded[1:-1, :-2])
+        & (center < padded[1:-1, 2:])
+    )
 
 
 def load(data):
     # parse into a 2d matrix of integers
-    return np.fromiter(remove("\n", data), dtype=int).reshape(-1, data.index("\n"))
+    data = data.strip()
+    digits = np.frombuffer(data.replace("\n", "").encode(), dtype=np.uint8)
+    return (digits - ord("0")).reshape(-1, data.index("\n"))
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2021, day=9)
+    if sys.argv[1:2] == ["--tiled"]:
+        # process a heightmap file of any size in bands of rows
+        ans1, ans2 = tiled(sys.argv[2])
+    else:
+        data = script_input(day=9)
+
+        ans1 = part1(load(data))
+        ans2 = part2(load(data))
 
-    ans1 = part1(load(puzzle.input_data))
-    # puzzle.answer_a = ans1
-    ans2 = part2(load(puzzle.input_data))
-    # puzzle.answer_b = ans2
+    print(ans1, ans2, sep="\n")
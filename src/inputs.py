@@ -0,0 +1,168 @@
+# Advent of Code 2021, Input Store
+# (c) blu3r4y
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+YEAR = 2021
+
+# inputs are stored by their content hash, next to a manifest that maps days to
+# hashes - the location can be overwritten with the AOC_INPUTS environment variable
+STORE_PATH = Path(os.environ.get("AOC_INPUTS", Path(__file__).parents[1] / "inputs"))
+MANIFEST = "manifest.json"
+
+
+class InputStore:
+    def __init__(self, path=STORE_PATH):
+        self.path = Path(path)
+        self.manifest = self._read_manifest()
+
+    def __contains__(self, day):
+        return str(day) in self.manifest
+
+    def file(self, day):
+        if day not in self:
+            raise KeyError(f"no input for day {day} in {self.path}")
+        return self.path / self.manifest[str(day)]["file"]
+
+    def read(self, day):
+        return self.file(day).read_bytes().decode("utf-8")
+
+    def read_all(self, days):
+        # bulk read of multiple inputs, fetching the missing ones first
+        for day in days:
+            if day not in self:
+                self.fetch(day)
+        return {day: self.read(day) for day in days}
+
+    @contextmanager
+    def mmap(self, day):
+        # memory-mapped, read-only view of the raw input bytes
+        with open(self.file(day), "rb") as fp:
+            with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                yield mm
+
+    def add(self, day, data):
+        raw = normalize(data).encode("utf-8")
+        digest = hashlib.sha256(raw).hexdigest()
+
+        # identical inputs are only stored once
+        self.path.mkdir(parents=True, exist_ok=True)
+        file = self.path / f"{digest}.txt"
+        if not file.exists():
+            file.write_bytes(raw)
+
+        self.manifest[str(day)] = {
+            "file": file.name,
+            "sha256": digest,
+            "size": len(raw),
+        }
+        self._write_manifest()
+
+        return digest
+
+    def fetch(self, day):
+        # this is the only path that needs the network and an aocd token
+        from aocd.models import Puzzle
+
+        return self.add(day, Puzzle(year=YEAR, day=day).input_data)
+
+    def verify(self, day):
+        entry = self.manifest[str(day)]
+        digest = hashlib.sha256(self.file(day).read_bytes()).hexdigest()
+        return digest == entry["sha256"]
+
+    def _read_manifest(self):
+        file = self.path / MANIFEST
+        if not file.exists():
+            return {}
+        return json.loads(file.read_text())
+
+    def _write_manifest(self):
+        file = self.path / MANIFEST
+        days = sorted(self.manifest, key=int)
+        file.write_text(json.dumps({d: self.manifest[d] for d in days}, indent=2))
+
+
+def puzzle_input(day, path=None):
+    # an explicit local file takes precedence over the store
+    if path is not None:
+        return normalize(Path(path).read_bytes().decode("utf-8"))
+
+    store = InputStore()
+    if day not in store:
+        store.fetch(day)
+
+    return store.read(day)
+
+
+def script_input(day):
+    # input for a solution that is run as a script, with an optional file argument
+    path = sys.argv[1] if len(sys.argv) > 1 else None
+    return puzzle_input(day, path)
+
+
+def script_stream(parse, chunk_size=2**20):
+    # parsed chunks of stdin for a solution that is run as a script with "-",
+    # or None, if it reads its whole input as usual
+    if sys.argv[1:] != ["-"]:
+        return None
+    return stream(sys.stdin, parse, chunk_size)
+
+
+def stream(fp, parse, chunk_size=2**20):
+    # parse a file or pipe in chunks of whole lines, with roughly chunk_size characters
+    rest = ""
+    while True:
+        block = fp.read(chunk_size)
+        if not block:
+            break
+
+        # the last line may continue in the next block
+        block = rest + block
+        cut = block.rfind("\n") + 1
+        block, rest = block[:cut], block[cut:]
+
+        if block.strip():
+            yield parse(block)
+
+    if rest.strip():
+        yield parse(rest)
+
+
+def normalize(data):
+    # same as aocd, trailing line breaks are not part of the input
+    return data.rstrip("\r\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="manage the local input store")
+    parser.add_argument("--store", type=Path, default=STORE_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    fetch = commands.add_parser("fetch", help="download inputs with aocd")
+    fetch.add_argument("days", nargs="*", type=int, default=range(1, 25 + 1))
+    add = commands.add_parser("add", help="add a local input file")
+    add.add_argument("day", type=int)
+    add.add_argument("file", type=Path)
+    commands.add_parser("list", help="list and verify stored inputs")
+
+    args = parser.parse_args()
+    store = InputStore(args.store)
+
+    if args.command == "fetch":
+        for day in args.days:
+            if day not in store:
+                print(f"day {day:2d} | {store.fetch(day)}")
+    elif args.command == "add":
+        print(f"day {args.day:2d} | {store.add(args.day, args.file.read_text())}")
+    elif args.command == "list":
+        for day in sorted(map(int, store.manifest)):
+            entry, ok = store.manifest[str(day)], store.verify(day)
+            print(f"day {day:2d} | {entry['sha256']} | {entry['size']:8d} bytes | {ok}")
@@ -0,0 +1,153 @@
+# Advent of Code 2021, Instrumentation
+# (c) blu3r4y
+
+import cProfile
+import json
+import os
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from functools import wraps
+from pathlib import Path
+from time import perf_counter, process_time
+
+# settings can also be given by environment variables, e.g., AOC_PROFILE=cprofile
+CONFIG = {
+    # print every record to stderr
+    "verbose": os.environ.get("AOC_VERBOSE", "0") == "1",
+    # trace the peak memory usage, which slows down execution
+    "memory": os.environ.get("AOC_MEMORY", "0") == "1",
+    # either None, "cprofile" or "sample"
+    "profile": os.environ.get("AOC_PROFILE") or None,
+    "profile_dir": os.environ.get("AOC_PROFILE_DIR", "profiles"),
+    # interval of the sampling profiler in seconds
+    "interval": 0.001,
+}
+
+# records of all instrumented calls, until they are drained
+RECORDS = []
+CALLS = Counter()
+
+
+def configure(**kwargs):
+    unknown = set(kwargs) - set(CONFIG)
+    assert not unknown, f"unknown settings {unknown}"
+    CONFIG.update(kwargs)
+
+
+def drain():
+    # get all records collected so far and clear them
+    records = RECORDS.copy()
+    RECORDS.clear()
+    return records
+
+
+def instrument(func):
+    module = Path(func.__code__.co_filename).stem
+    name = f"{module}.{func.__qualname__}"
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        CALLS[name] += 1
+        profiler = Profiler(name) if CONFIG["profile"] else None
+
+        # nested instrumented calls keep tracing memory for the outer call
+        memory = CONFIG["memory"]
+        owner = memory and not tracemalloc.is_tracing()
+        if owner:
+            tracemalloc.start()
+
+        wall, cpu = perf_counter(), process_time()
+        try:
+            if profiler:
+                with profiler:
+                    return func(*args, **kwargs)
+            return func(*args, **kwargs)
+
+        finally:
+            wall, cpu = perf_counter() - wall, process_time() - cpu
+            peak = tracemalloc.get_traced_memory()[1] if memory else None
+            if owner:
+                tracemalloc.stop()
+
+            record = {
+                "function": name,
+                "calls": CALLS[name],
+                "wall": wall,
+                "cpu": cpu,
+                "memory": peak,
+                "profile": str(profiler.path) if profiler else None,
+            }
+            RECORDS.append(record)
+
+            if CONFIG["verbose"]:
+                print(json.dumps(record), file=sys.stderr)
+
+    return wrapper
+
+
+class Profiler:
+    def __init__(self, name):
+        self.mode = CONFIG["profile"]
+        assert self.mode in ("cprofile", "sample"), f"unknown profiler {self.mode}"
+
+        suffix = ".prof" if self.mode == "cprofile" else ".folded"
+        self.path = Path(CONFIG["profile_dir"]) / f"{name}.{CALLS[name]}{suffix}"
+        self.profiler = None
+
+    def __enter__(self):
+        if self.mode == "cprofile":
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        else:
+            self.profiler = Sampler(CONFIG["interval"])
+            self.profiler.start()
+
+    def __exit__(self, *exc):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.mode == "cprofile":
+            # inspect with pstats or snakeviz
+            self.profiler.disable()
+            self.profiler.dump_stats(self.path)
+        else:
+            # collapsed stacks, as consumed by flamegraph.pl or speedscope
+            self.profiler.stop()
+            self.profiler.dump(self.path)
+
+
+class Sampler:
+    # a minimal sampling profiler that periodically captures the stack of a thread
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.target = threading.get_ident()
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._sample, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+
+    def dump(self, path):
+        with open(path, "w") as fp:
+            for stack, count in self.stacks.most_common():
+                print(f"{stack} {count}", file=fp)
+
+    def _sample(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.target)
+
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(
+                    f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})"
+                )
+                frame = frame.f_back
+
+            self.stacks[";".join(reversed(stack))] += 1
@@ -0,0 +1,38 @@
+# Advent of Code 2021, Progress Bars
+# (c) blu3r4y
+
+import os
+
+# progress bars can be disabled with AOC_PROGRESS=0, which also skips importing tqdm
+ENABLED = os.environ.get("AOC_PROGRESS", "1") == "1"
+
+
+def tqdm(iterable=None, **kwargs):
+    if not ENABLED:
+        return Silent(iterable)
+
+    from tqdm.auto import tqdm as _tqdm
+
+    return _tqdm(iterable, **kwargs)
+
+
+class Silent:
+    # stands in for a tqdm progress bar, but does nothing
+
+    def __init__(self, iterable=None):
+        self.iterable = iterable
+
+    def __iter__(self):
+        return iter(self.iterable)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def update(self, n=1):
+        pass
+
+    def set_postfix(self, *args, **kwargs):
+        pass
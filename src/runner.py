@@ -0,0 +1,151 @@
+# Advent of Code 2021, Runner
+# (c) blu3r4y
+
+import argparse
+import inspect
+import os
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from importlib import import_module
+from pathlib import Path
+from time import perf_counter
+
+import progress
+from inputs import STORE_PATH, InputStore
+from instrument import configure, drain
+
+DAYS = tuple(range(1, 25 + 1))
+
+# the slowest days are dispatched first, so that they
+# do not end up as the long tail of the process pool
+SLOWEST = (23, 19, 18, 22, 20)
+
+PARTS = ("part1", "part2")
+
+
+def main(days, jobs=None, store=STORE_PATH, **config):
+    start = perf_counter()
+
+    # read all inputs at once, so that workers never touch the store or network
+    inputs = InputStore(store).read_all(days)
+
+    pool = ProcessPoolExecutor(jobs, initializer=init_worker, initargs=(config,))
+    with pool:
+        futures = {
+            pool.submit(run_day, day, inputs[day]): day for day in schedule(days)
+        }
+        for future in as_completed(futures):
+            day = futures[future]
+            try:
+                report(day, future.result())
+            except Exception as ex:
+                print(f"day {day:2d} | failed with {type(ex).__name__}: {ex}")
+
+    print(f"total wall time {perf_counter() - start:.3f}s")
+
+
+def init_worker(config):
+    # progress bars of parallel workers would only clutter the output
+    progress.ENABLED = False
+
+    # instrumentation settings, e.g., memory tracing, are applied in every worker
+    configure(**config)
+
+
+def schedule(days):
+    slow = [d for d in SLOWEST if d in days]
+    return slow + [d for d in days if d not in slow]
+
+
+def run_day(day, data):
+    module = import_module(f"day{day}")
+
+    results = []
+    for name in PARTS:
+        # the last day only has a single part
+        part = getattr(module, name, None)
+        if part is None:
+            continue
+
+        # parts may mutate their input, so load it for each part
+        start = perf_counter()
+        args = module.load(data)
+        load_time = perf_counter() - start
+
+        # the outermost instrumented call is recorded last
+        answer = call(part, args)
+        record = drain()[-1]
+
+        results.append({"part": name, "answer": answer, "load": load_time, **record})
+
+    return results
+
+
+def call(part, args):
+    # unpack the loaded input for parts that expect more than one argument
+    params = inspect.signature(part).parameters.values()
+    required = [p for p in params if p.default is p.empty]
+    return part(*args) if len(required) > 1 else part(args)
+
+
+def profile_imports(days):
+    start = perf_counter()
+
+    for day in days:
+        total, slowest = import_times(day)
+        text = ", ".join(f"{name} {t / 1e6:.3f}s" for name, t in slowest)
+        print(f"day {day:2d} | import {total / 1e6:8.3f}s | {text}")
+
+    print(f"total wall time {perf_counter() - start:.3f}s")
+
+
+def import_times(day, top=3):
+    # cold start of a single solution in a fresh interpreter
+    cmd = [sys.executable, "-X", "importtime", "-c", f"import day{day}"]
+    cwd = Path(__file__).parent
+    proc = subprocess.run(cmd, capture_output=True, text=True, cwd=cwd, check=True)
+
+    # lines are "import time: self [us] | cumulative | imported package",
+    # where nested imports are indented and listed before their parent
+    imports = []
+    for line in proc.stderr.splitlines()[1:]:
+        _, cumulative, name = line.split("|")
+        level = len(name) - len(name.lstrip())
+        imports.append((level, name.strip(), int(cumulative)))
+
+    # the module itself is imported last, after all of its own imports
+    level, _, total = imports[-1]
+    first = max(i for i, imp in enumerate(imports[:-1]) if imp[0] <= level) + 1
+    direct = [(name, t) for lvl, name, t in imports[first:-1] if lvl == level + 2]
+
+    return total, sorted(direct, key=lambda e: e[1], reverse=True)[:top]
+
+
+def report(day, results):
+    for r in results:
+        text = (
+            f"day {day:2d} | {r['part']} | {str(r['answer']):>16} | "
+            f"load {r['load']:8.3f}s | solve {r['wall']:8.3f}s | cpu {r['cpu']:8.3f}s"
+        )
+        if r["memory"] is not None:
+            text += f" | peak {r['memory'] / 2**20:8.1f} MiB"
+        print(text)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="run all solutions in parallel")
+    parser.add_argument("days", nargs="*", type=int, default=DAYS)
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count())
+    parser.add_argument("--inputs", type=Path, default=STORE_PATH)
+    parser.add_argument("--memory", action="store_true", help="trace peak memory")
+    parser.add_argument("--profile", choices=("cprofile", "sample"), default=None)
+    parser.add_argument("--imports", action="store_true", help="profile import times")
+    args = parser.parse_args()
+
+    if args.imports:
+        profile_imports(args.days)
+    else:
+        main(
+            args.days, args.jobs, args.inputs, memory=args.memory, profile=args.profile
+        )